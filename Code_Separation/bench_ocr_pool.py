@@ -0,0 +1,67 @@
+"""
+Benchmark: folder-scan OCR throughput (images per minute) against the number
+of OcrPool worker processes.
+
+    python bench_ocr_pool.py FOLDER [workers ...] [--limit N]
+
+Worker counts default to 1 2 4.  Model loading is timed separately from the
+scan itself, since the pool keeps its workers (and their readers) between
+scans.  Needs easyocr and torch installed.
+"""
+import os
+import sys
+import time
+from concurrent.futures import wait
+
+from PyQt5.QtCore import QCoreApplication
+
+from ocr_pool import OcrPool
+
+SUPPORTED_EXTS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff')
+
+
+def run(image_paths, workers):
+    pool = OcrPool(workers=workers)
+    started = time.perf_counter()
+    wait(pool.start())
+    load_s = time.perf_counter() - started
+
+    finished = []
+    pool.result_ready.connect(lambda path, text, info, passes: finished.append(time.perf_counter()))
+    pool.failed.connect(lambda path, error: print(f"  failed: {path}: {error}"))
+    started = time.perf_counter()
+    futures = [pool.submit(path) for path in image_paths]
+    while len(finished) < len(futures) and not all(f.done() for f in futures):
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    QCoreApplication.processEvents()
+    elapsed = time.perf_counter() - started
+    first = finished[0] - started if finished else float("nan")
+    pool.shutdown()
+    return load_s, first, elapsed
+
+
+def main():
+    args = sys.argv[1:]
+    limit = None
+    if "--limit" in args:
+        i = args.index("--limit")
+        limit = int(args[i + 1])
+        del args[i:i + 2]
+    if not args:
+        sys.exit(__doc__)
+    folder = args[0]
+    counts = [int(a) for a in args[1:]] or [1, 2, 4]
+    image_paths = sorted(os.path.join(folder, f) for f in os.listdir(folder)
+                         if f.lower().endswith(SUPPORTED_EXTS))[:limit]
+
+    app = QCoreApplication([])
+    print(f"{len(image_paths)} images, {os.cpu_count()} CPUs\n")
+    print(f"{'workers':>8}{'load s':>9}{'first s':>9}{'scan s':>9}{'img/min':>9}")
+    for workers in counts:
+        load_s, first, elapsed = run(image_paths, workers)
+        print(f"{workers:>8}{load_s:>9.1f}{first:>9.1f}{elapsed:>9.1f}{len(image_paths) / elapsed * 60:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
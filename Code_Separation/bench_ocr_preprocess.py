@@ -0,0 +1,92 @@
+"""
+Benchmark: OCR preprocessing (prepare_image) settings - accuracy and latency.
+
+Runs extract_text_from_image over a sample corpus with several long-edge caps,
+with and without the label crop, and reports the time spent preparing the
+image, the total time per image, and how many CAS / catalog numbers were read
+correctly.  Ground truth comes from FOLDER/labels.csv (columns: file,
+cas_number, catalog_number); without it the full-resolution run is used as
+the reference.
+
+    python bench_ocr_preprocess.py FOLDER [--limit N]
+
+Needs easyocr and torch installed.
+"""
+import csv
+import os
+import sys
+import time
+
+import ocr_utils
+from bench_ocr_sweep import SUPPORTED_EXTS, identifiers
+
+CASES = [  # (label, max_edge, label_crop)
+    ("full size", 0, False),
+    ("cap 2400", 2400, False),
+    ("cap 1600", 1600, False),
+    ("cap 1200", 1200, False),
+    ("cap 1600 + crop", 1600, True),
+    ("cap 1200 + crop", 1200, True),
+]
+
+
+def load_truth(folder):
+    path = os.path.join(folder, "labels.csv")
+    if not os.path.exists(path):
+        return None
+    with open(path, newline="") as f:
+        return {os.path.join(folder, row["file"]): (row["cas_number"] or None, row["catalog_number"] or None)
+                for row in csv.DictReader(f)}
+
+
+def run(image_paths, max_edge, label_crop):
+    ocr_utils.OCR_MAX_EDGE, ocr_utils.OCR_LABEL_CROP = max_edge, label_crop
+    prepare_s = ocr_s = 0.0
+    found = {}
+    for path in image_paths:
+        start = time.perf_counter()
+        ocr_utils.prepare_image(path)
+        prepare_s += time.perf_counter() - start
+        start = time.perf_counter()
+        found[path] = identifiers(ocr_utils.extract_text_from_image(path))  # prepares again, inside
+        ocr_s += time.perf_counter() - start
+    count = len(image_paths)
+    return prepare_s / count, ocr_s / count, found
+
+
+def main():
+    args = sys.argv[1:]
+    limit = None
+    if "--limit" in args:
+        i = args.index("--limit")
+        limit = int(args[i + 1])
+        del args[i:i + 2]
+    if not args:
+        sys.exit(__doc__)
+    folder = args[0]
+    image_paths = sorted(os.path.join(folder, f) for f in os.listdir(folder)
+                         if f.lower().endswith(SUPPORTED_EXTS))[:limit]
+    if not image_paths:
+        sys.exit(f"no images in {folder}")
+
+    truth = load_truth(folder)
+    if truth is not None:
+        image_paths = [path for path in image_paths if path in truth]
+    ocr_utils.get_reader()  # model load is not part of any case
+    print(f"{len(image_paths)} images, sweep={ocr_utils.OCR_SWEEP}, "
+          f"reference={'labels.csv' if truth is not None else 'full size run'}\n")
+    print(f"{'case':<18}{'prep ms':>9}{'ms/image':>10}{'CAS ok':>8}{'cat. ok':>9}")
+    for label, max_edge, label_crop in CASES:
+        prepare_s, per_image, found = run(image_paths, max_edge, label_crop)
+        if truth is None:
+            truth = found  # the first case is full size
+        cas_ok = sum(1 for path in image_paths if truth[path][0] and found[path][0] == truth[path][0])
+        cat_ok = sum(1 for path in image_paths if truth[path][1] and found[path][1] == truth[path][1])
+        cas_total = sum(1 for path in image_paths if truth[path][0])
+        cat_total = sum(1 for path in image_paths if truth[path][1])
+        print(f"{label:<18}{prepare_s * 1000:>9.0f}{per_image * 1000:>10.0f}"
+              f"{f'{cas_ok}/{cas_total}':>8}{f'{cat_ok}/{cat_total}':>9}")
+
+
+if __name__ == "__main__":
+    main()
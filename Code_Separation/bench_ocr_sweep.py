@@ -0,0 +1,73 @@
+"""
+Benchmark: full contrast sweep vs. early exit vs. two-stage OCR in
+extract_text_from_image.
+
+Runs each strategy over a folder of label photos with the same reader and
+reports time per image, passes per image (a two-stage pass is one
+detection plus one batched recognition), and how often each
+strategy found the same CAS / catalog number as the full sweep (the PubChem
+lookup is skipped so only OCR is timed).
+
+    python bench_ocr_sweep.py FOLDER [--limit N]
+
+Needs easyocr and torch installed.
+"""
+import os
+import sys
+import time
+
+import ocr_utils
+from ocr_utils import CAS_PATTERN, CATALOG_PATTERN, is_valid_cas
+
+SUPPORTED_EXTS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff')
+
+
+def identifiers(text):
+    """(first valid CAS number, first catalog number) found in text."""
+    cas = next(filter(is_valid_cas, CAS_PATTERN.findall(text)), None)
+    catalog = CATALOG_PATTERN.search(text)
+    return cas, catalog.group(1) if catalog else None
+
+
+def run(image_paths, sweep):
+    ocr_utils.sweep_stats.update(images=0, passes=0)
+    found = {}
+    start = time.perf_counter()
+    for path in image_paths:
+        found[path] = identifiers(ocr_utils.extract_text_from_image(path, sweep=sweep))
+    elapsed = time.perf_counter() - start
+    return elapsed / len(image_paths), ocr_utils.average_passes(), found
+
+
+def main():
+    args = sys.argv[1:]
+    limit = None
+    if "--limit" in args:
+        i = args.index("--limit")
+        limit = int(args[i + 1])
+        del args[i:i + 2]
+    if not args:
+        sys.exit(__doc__)
+    folder = args[0]
+    image_paths = sorted(os.path.join(folder, f) for f in os.listdir(folder)
+                         if f.lower().endswith(SUPPORTED_EXTS))[:limit]
+    if not image_paths:
+        sys.exit(f"no images in {folder}")
+
+    ocr_utils.get_reader()  # model load is not part of either strategy
+    device = ocr_utils.engine_settings["device"] if ocr_utils.engine_settings else "?"
+    # two_stage only batches recognition on GPU; run once per device to compare
+    print(f"{len(image_paths)} images on {device}, contrast levels {ocr_utils.OCR_CONTRAST_LEVELS}\n")
+    print(f"{'sweep':<12}{'ms/image':>10}{'passes':>8}{'CAS found':>11}{'cat. found':>11}{'same IDs':>10}")
+    results = {sweep: run(image_paths, sweep) for sweep in ("full", "early_exit", "two_stage")}
+    baseline = results["full"][2]
+    for sweep, (per_image, passes, found) in results.items():
+        cas = sum(1 for c, _ in found.values() if c)
+        catalog = sum(1 for _, c in found.values() if c)
+        same = sum(1 for path in image_paths if found[path] == baseline[path])
+        print(f"{sweep:<12}{per_image * 1000:>10.0f}{passes:>8.2f}{cas:>11}{catalog:>11}"
+              f"{same / len(image_paths):>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: loading the table with every display column vs. only
+config.TABLE_COLUMNS (wide columns fetched per row for the detail pane).
+
+Builds a temporary database with realistic long IUPAC names and URLs, then
+times the query + fetch and measures the memory the loaded rows hold.  Each
+case runs in its own process so RSS numbers don't leak between cases.
+
+    python bench_projection.py [rows]
+"""
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_table_model import rss_mb
+
+CASES = ("all columns", "table columns", "first page", "detail row")
+
+
+def synthetic_rows(count, seed=1):
+    rng = random.Random(seed)
+    makers = ["Sigma-Aldrich", "Fisher", "Merck", "TCI", "Alfa Aesar", "VWR"]
+    for i in range(count):
+        cid = rng.randint(1, 10_000_000)
+        yield (f"compound {i}", f"{rng.randint(50, 99999)}-{rng.randint(10, 99)}-{rng.randint(0, 9)}",
+               "C16H13ClN2O", f"common {i % 5000}",
+               f"(2S,3R,4S,5R,6R)-2-[(4-{i}-chloro-2-methylphenyl)amino]-6-(hydroxymethyl)"
+               f"-4-[(3,4,5-trihydroxyoxan-2-yl)oxy]oxane-3,5-diol",
+               f"Fridge {rng.randint(1, 20)}", rng.randint(0, 5),
+               f"https://pubchem.ncbi.nlm.nih.gov/compound/{cid}#section=Safety-and-Hazards",
+               rng.choice(makers), f"A{rng.randint(1000, 999999)}",
+               f"https://www.sigmaaldrich.com/GB/en/product/sial/a{rng.randint(1000, 999999)}")
+
+
+def build(db_path, count):
+    import connection
+    from database import create_database
+    create_database(db_path, readonly=False)
+    with connection.write_transaction(db_path) as conn:
+        conn.executemany('''
+            INSERT INTO Chemicals (
+                name, cas_number, formula, common_name, iupac_name, location, quantity,
+                safety_info_url, manufacturer, catalog_number, product_url
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', synthetic_rows(count))
+    connection.close_all()
+
+
+def run_case(case, db_path):
+    from repository import ChemicalRepository, SQLiteBackend, DISPLAY_COLUMNS, TABLE_COLUMNS
+    repo = ChemicalRepository(SQLiteBackend(db_path))
+    conn = repo.backend.connection()
+    conn.execute("SELECT COUNT(*) FROM Chemicals").fetchone()  # open + warm the connection
+    before = rss_mb()
+
+    start = time.perf_counter()
+    if case == "all columns":
+        # what load_data used to run
+        rows = conn.execute(f"SELECT {', '.join(DISPLAY_COLUMNS)} FROM Chemicals ORDER BY name").fetchall()
+    elif case == "table columns":
+        rows = conn.execute(f"SELECT {', '.join(TABLE_COLUMNS)} FROM Chemicals ORDER BY name").fetchall()
+    elif case == "first page":
+        rows = repo.page()
+    else:
+        rows = [repo.details(1)]
+    elapsed = time.perf_counter() - start
+
+    print(f"{elapsed:.4f} {rss_mb() - before:.1f} {len(rows)}")
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "--case":
+        run_case(args[1], args[2])
+        return
+
+    count = int(args[0]) if args else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        start = time.perf_counter()
+        build(db_path, count)
+        print(f"built {count} rows in {time.perf_counter() - start:.1f}s\n")
+
+        print(f"{'case':<16}{'ms':>10}{'RSS +MB':>10}{'rows':>9}")
+        for case in CASES:
+            out = subprocess.run([sys.executable, __file__, "--case", case, db_path],
+                                 capture_output=True, text=True, check=True).stdout.split()
+            print(f"{case:<16}{float(out[-3]) * 1000:>10.1f}{float(out[-2]):>10.1f}{int(out[-1]):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: FTS5 search vs. the LOWER(col) LIKE '%term%' scan.
+
+Builds a synthetic inventory in a temporary database and times both search
+paths for a handful of typical queries.
+
+    python bench_search.py [rows] [repeats] [--memory]
+
+--memory runs against the in-memory backend instead of a temporary file.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import connection
+from database import create_database
+from repository import ChemicalRepository, SQLiteBackend, MemoryBackend
+
+WORDS = ["acetone", "ethanol", "methanol", "sodium", "chloride", "hydroxide", "benzene",
+         "toluene", "acid", "sulfate", "nitrate", "potassium", "amine", "phosphate",
+         "glycine", "lithium", "bromide", "iodide", "carbonate", "acetate"]
+MAKERS = ["Sigma-Aldrich", "Fisher", "Merck", "TCI", "Alfa Aesar", "VWR"]
+QUERIES = ["ethanol", "sodium chloride", "64-17-5", "sigma", "acet", "fridge 3"]
+
+
+def synthetic_rows(count, seed=1):
+    rng = random.Random(seed)
+    for i in range(count):
+        name = " ".join(rng.sample(WORDS, 2)) + f" {i}"
+        cas = f"{rng.randint(50, 99999)}-{rng.randint(10, 99)}-{rng.randint(0, 9)}"
+        yield (name, cas, None, rng.choice(WORDS), name.upper(), f"fridge {rng.randint(1, 9)}",
+               rng.randint(0, 5), None, rng.choice(MAKERS), f"A{rng.randint(1000, 999999)}", None)
+    yield ("ethanol absolute", "64-17-5", "C2H6O", "ethanol", "ethanol", "fridge 3",
+           1, None, "Sigma-Aldrich", "E7023", None)
+
+
+def build(backend, count):
+    with backend.transaction() as conn:
+        conn.executemany('''
+            INSERT INTO Chemicals (
+                name, cas_number, formula, common_name, iupac_name, location, quantity,
+                safety_info_url, manufacturer, catalog_number, product_url
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', synthetic_rows(count))
+
+
+def timed(fn, query, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        rows = fn(query)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(rows)
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    count = int(args[0]) if len(args) > 0 else 100_000
+    repeats = int(args[1]) if len(args) > 1 else 5
+    with tempfile.TemporaryDirectory() as tmp:
+        if "--memory" in sys.argv:
+            backend = MemoryBackend()
+        else:
+            db_path = os.path.join(tmp, "bench.db")
+            create_database(db_path, readonly=False)
+            backend = SQLiteBackend(db_path)
+        repo = ChemicalRepository(backend)
+
+        start = time.perf_counter()
+        build(backend, count)
+        print(f"built {count} rows in {time.perf_counter() - start:.1f}s\n")
+
+        print(f"{'query':<18}{'LIKE ms':>10}{'rows':>8}{'FTS ms':>10}{'rows':>8}{'speedup':>9}")
+        for query in QUERIES:
+            like_ms, like_rows = timed(repo.search_like, query, repeats)
+            fts_ms, fts_rows = timed(repo.search_fts, query, repeats)
+            print(f"{query:<18}{like_ms:>10.1f}{like_rows:>8}{fts_ms:>10.1f}{fts_rows:>8}"
+                  f"{like_ms / max(fts_ms, 1e-6):>8.1f}x")
+        connection.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: application startup.
+
+1. `python -X importtime -c "import main"` - total import time and the
+   slowest top-level imports.
+2. Wall clock from process start to the first paint of the login dialog and
+   of the main window (offscreen, against a temporary database), median of
+   several runs.
+
+    python bench_startup.py [runs] [--eager]
+
+--eager also loads easyocr and its Reader before the login dialog, which is
+what every launch did before the OCR imports were made lazy (needs easyocr
+installed).
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_times():
+    """[(cumulative_us, module)] of the modules main imports directly, plus the total in us."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=HERE, capture_output=True, text=True)
+    top, total = [], 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        level = (len(name) - len(name.lstrip()) - 1) // 2  # two spaces per nesting level
+        if level == 1:
+            top.append((int(cumulative), name.strip()))
+    return sorted(top, reverse=True), total
+
+
+def first_paint(eager, db_path):
+    """Run one child process; returns (seconds to login paint, seconds to window paint)."""
+    started = time.time()
+    out = subprocess.run([sys.executable, __file__, "--child", "1" if eager else "0", db_path],
+                         cwd=HERE, capture_output=True, text=True, check=True,
+                         env=dict(os.environ, QT_QPA_PLATFORM="offscreen")).stdout.split()
+    return float(out[-2]) - started, float(out[-1]) - started
+
+
+def child(eager, db_path):
+    # the same imports main.py does, in the same order
+    from PyQt5.QtCore import QObject, QEvent
+    from PyQt5.QtWidgets import QApplication
+    from database import create_database
+    from ui_mainwindow import MainWindow
+    from login_dialog import LoginDialog
+    import connection
+
+    class PaintWatch(QObject):
+        def __init__(self):
+            super().__init__()
+            self.painted = None
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and self.painted is None:
+                self.painted = time.time()
+            return False
+
+    def show_and_wait(widget):
+        watch = PaintWatch()
+        widget.installEventFilter(watch)
+        widget.show()
+        while watch.painted is None:
+            app.processEvents()
+        return watch.painted
+
+    app = QApplication([])
+    if eager:
+        import ocr_utils
+        ocr_utils.get_reader()
+    connection.configure(db_path)
+    create_database(db_path, readonly=False)
+    login = show_and_wait(LoginDialog(allow_password_change=True))
+    main_window = MainWindow(db_path)
+    window = show_and_wait(main_window)
+    main_window.close()
+    print(login, window)
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "--child":
+        child(args[1] == "1", args[2])
+        return
+
+    eager = "--eager" in args
+    args = [a for a in args if not a.startswith("--")]
+    runs = int(args[0]) if args else 5
+
+    top, total = import_times()
+    print(f"import main: {total / 1000:.0f} ms total (self times summed)")
+    for cumulative, name in top[:10]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        first_paint(eager, db_path)  # creates the database; not timed
+        samples = [first_paint(eager, db_path) for _ in range(runs)]
+    print(f"\nfirst paint ({'eager OCR' if eager else 'lazy OCR'}, median of {runs}):")
+    print(f"  login dialog  {statistics.median(s[0] for s in samples) * 1000:>8.0f} ms")
+    print(f"  main window   {statistics.median(s[1] for s in samples) * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: table refresh time and memory, ChemicalTableModel vs. the old
+one-QTableWidgetItem-per-cell table.
+
+Each case runs in its own process so RSS numbers don't leak between cases.
+
+    python bench_table_model.py [rows ...] [--widget-max N]
+
+Defaults to 10k, 100k and 1M rows; the QTableWidget case is skipped above
+--widget-max rows (default 100k) because it takes minutes and gigabytes.
+"""
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+VISIBLE_ROWS = 40  # roughly one screen
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def synthetic_rows(count, seed=1):
+    """Rows in CHEMICAL_COLUMNS order."""
+    rng = random.Random(seed)
+    locations = [f"Fridge {i}" for i in range(20)] + [f"Cabinet {c}" for c in "ABCDEFGH"]
+    makers = ["Sigma-Aldrich", "Fisher", "Merck", "TCI", "Alfa Aesar", "VWR"]
+    return [
+        (i, f"compound {i}", f"{rng.randint(50, 99999)}-{rng.randint(10, 99)}-{rng.randint(0, 9)}",
+         "C6H12O6", f"common {i % 5000}", f"(2R,3S)-2,3,4,5,6-pentahydroxyhexanal {i}",
+         rng.choice(locations), rng.randint(0, 5), f"https://pubchem.ncbi.nlm.nih.gov/compound/{i}",
+         rng.choice(makers), f"A{rng.randint(1000, 999999)}", None)
+        for i in range(count)
+    ]
+
+
+def fill_widget(table, rows):
+    """The pre-model refresh: one QTableWidgetItem per cell."""
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtWidgets import QTableWidgetItem
+    from table_model import HEADERS
+    table.blockSignals(True)
+    table.clear()
+    table.setRowCount(len(rows))
+    table.setColumnCount(len(HEADERS))
+    table.setHorizontalHeaderLabels(HEADERS)
+    for row_idx, row_data in enumerate(rows):
+        for col_idx, value in enumerate(row_data[:len(HEADERS)]):
+            item = QTableWidgetItem(str(value))
+            table.setItem(row_idx, col_idx, item)
+            if col_idx == 0:
+                item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
+            else:
+                item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
+    table.blockSignals(False)
+
+
+def run_case(kind, count):
+    from PyQt5.QtWidgets import QApplication, QTableWidget
+    from table_model import ChemicalTableModel
+    from repository import CHEMICAL_COLUMNS, TABLE_COLUMNS
+    app = QApplication([])
+    # what the table query returns: only the visible columns
+    picks = [CHEMICAL_COLUMNS.index(field) for field in TABLE_COLUMNS]
+    rows = [tuple(row[i] for i in picks) for row in synthetic_rows(count)]
+    before = rss_mb()
+
+    start = time.perf_counter()
+    if kind == "model":
+        model = ChemicalTableModel()
+        model.set_rows(rows)
+        # what the view asks for to paint the first screen
+        for r in range(min(VISIBLE_ROWS, count)):
+            for c in range(model.columnCount()):
+                model.data(model.index(r, c))
+    else:
+        table = QTableWidget()
+        fill_widget(table, rows)
+    elapsed = time.perf_counter() - start
+
+    del rows  # the model keeps its own column lists; count only what stays resident
+    print(f"{elapsed:.3f} {rss_mb() - before:.1f}")
+    app.quit()
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "--case":
+        run_case(args[1], int(args[2]))
+        return
+
+    widget_max = 100_000
+    if "--widget-max" in args:
+        i = args.index("--widget-max")
+        widget_max = int(args[i + 1])
+        del args[i:i + 2]
+    counts = [int(a) for a in args] or [10_000, 100_000, 1_000_000]
+
+    print(f"{'rows':>10}{'impl':>10}{'refresh s':>12}{'RSS +MB':>10}")
+    for count in counts:
+        for kind in ("model", "widget"):
+            if kind == "widget" and count > widget_max:
+                print(f"{count:>10}{kind:>10}{'skipped':>12}")
+                continue
+            out = subprocess.run([sys.executable, __file__, "--case", kind, str(count)],
+                                 capture_output=True, text=True, check=True).stdout.split()
+            print(f"{count:>10}{kind:>10}{float(out[-2]):>12.3f}{float(out[-1]):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Check: save_many() merges a batch exactly as saving the same entries one by
+one with save() would, and repository.normalize() agrees with the match keys
+SQLite stores (migrations._key_expr).
+
+Runs against throwaway in-memory databases; prints each mismatch and exits
+non-zero if there is one.
+
+    python check_merge_keys.py
+"""
+import sys
+
+from migrations import MATCH_KEY_COLUMNS
+from repository import ChemicalRepository, MemoryBackend, normalize
+
+# whitespace, case and accents that str.strip()/str.lower() and TRIM()/LOWER() treat differently
+NAMES = ["Éthanol", "éthanol", "ÉTHANOL", "acid\t", "acid", " Acid ", "ACID", "acid\n",
+         "Straße", "STRASSE", "ıodine", "Iodine", " benzene", "benzene", "", "  "]
+
+
+def entries():
+    for i, name in enumerate(NAMES):
+        yield {"name": name, "common_name": None, "cas_number": None,
+               "catalog_number": None, "location": "A", "quantity": 1}
+        yield {"name": f"cas row {i}", "cas_number": name, "location": "A", "quantity": 1}
+        yield {"name": f"catalog row {i}", "catalog_number": name, "location": "A", "quantity": 1}
+
+
+def rows(repo):
+    conn = repo.backend.connection()
+    return conn.execute("SELECT id, name, cas_number, catalog_number, quantity FROM Chemicals ORDER BY id").fetchall()
+
+
+def main():
+    infos = [info for info in entries() if info.get("name")]
+    batch, single = ChemicalRepository(MemoryBackend()), ChemicalRepository(MemoryBackend())
+    batch_outcomes = batch.save_many(infos)
+    single_outcomes = [single.save(info) for info in infos]
+    failures = 0
+
+    for info, b, s in zip(infos, batch_outcomes, single_outcomes):
+        if b != s:
+            failures += 1
+            print(f"⚠️ {info!r}: batch {b}, one by one {s}")
+    if rows(batch) != rows(single):
+        failures += 1
+        print("⚠️ batch and one-by-one saves left different rows")
+
+    keys, columns = ", ".join(MATCH_KEY_COLUMNS), ", ".join(MATCH_KEY_COLUMNS.values())
+    for row in single.backend.connection().execute(f"SELECT id, {keys}, {columns} FROM Chemicals"):
+        stored = row[1:1 + len(MATCH_KEY_COLUMNS)]
+        expected = tuple(normalize(value) for value in row[1 + len(MATCH_KEY_COLUMNS):])
+        if stored != expected:
+            failures += 1
+            print(f"⚠️ row {row[0]}: stored keys {stored}, normalize() gives {expected}")
+
+    if failures:
+        sys.exit(f"{failures} mismatches")
+    print(f"✅ {len(infos)} entries: batch and one-by-one saves agree, stored keys match normalize()")
+
+
+if __name__ == "__main__":
+    main()
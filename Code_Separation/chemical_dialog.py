@@ -6,22 +6,25 @@ import webbrowser
 import urllib.parse
 import os
 from ocr_utils import enrich_with_pubchem
+from thumbnails import get_thumbnail_cache
 
    # ====================CHEMICAL INFO DIALOG BOX=====================#
 class ChemicalEntryDialog(QDialog):
-    def __init__(self, info=None, image_path=None):
+    def __init__(self, info=None, image_path=None, allow_stop=False):
+        """allow_stop adds a Stop Scan button (folder scans); it rejects and sets stop_requested."""
         super().__init__()
         self.setFont(jetbrains_font)
         self.setWindowTitle("Enter Chemical Information")
         layout = QFormLayout()
 
         # === THUMBNAIL PREVIEW ===
-        # Show thumbnail if image path is provided
+        # Show thumbnail if image path is provided (from the disk cache, not the full photo)
         if image_path and os.path.exists(image_path):
             try:
-                pixmap = QPixmap(image_path)
+                pixmap = QPixmap(get_thumbnail_cache().get(image_path) or image_path)
                 if not pixmap.isNull():
-                    pixmap = pixmap.scaled(500, 500, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                    if pixmap.width() > 500 or pixmap.height() > 500:
+                        pixmap = pixmap.scaled(500, 500, Qt.KeepAspectRatio, Qt.SmoothTransformation)
                     image_label = QLabel()
                     image_label.setPixmap(pixmap)
                     image_label.setAlignment(Qt.AlignCenter)
@@ -43,6 +46,7 @@ class ChemicalEntryDialog(QDialog):
         self.fetch_pubchem_btn = QPushButton("Fetch from PubChem")
         self.fetch_pubchem_btn.clicked.connect(self.fetch_pubchem_data)
         self.safety_info_url_edit = QLineEdit(info.get("safety_info_url", "") if info else "")
+        self.product_url_edit = QLineEdit((info.get("product_url") or "") if info else "")
 
         layout.addRow("Name:", self.name_edit)
         layout.addRow("CAS Number:", self.cas_edit)
@@ -55,6 +59,7 @@ class ChemicalEntryDialog(QDialog):
         layout.addRow("Manufacturer:", self.manufacturer_edit)
         layout.addRow("Catalog Number:", self.catalog_number_edit)
         layout.addRow("Safety Info URL:", self.safety_info_url_edit)
+        layout.addRow("Product URL:", self.product_url_edit)
 
         # === SAFETY INFO LINK (OPTIONAL) ===
         if info and info.get("safety_info_url"):
@@ -73,10 +78,18 @@ class ChemicalEntryDialog(QDialog):
         self.buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         self.buttons.accepted.connect(self.accept)
         self.buttons.rejected.connect(self.reject)
+        self.stop_requested = False
+        if allow_stop:
+            stop_button = self.buttons.addButton("Stop Scan", QDialogButtonBox.DestructiveRole)
+            stop_button.clicked.connect(self.stop_scan)
         layout.addWidget(self.buttons)
 
         self.setLayout(layout)
 
+    def stop_scan(self):
+        self.stop_requested = True
+        self.reject()
+
     def fetch_pubchem_data(self):
             cas = self.cas_edit.text().strip()
        #     print(cas)
@@ -138,5 +151,5 @@ class ChemicalEntryDialog(QDialog):
             "manufacturer": self.manufacturer_edit.text().strip(),
             "catalog_number": self.catalog_number_edit.text().strip(),
             "safety_info_url": self.safety_info_url_edit.text().strip(),
-            "product_url": getattr(self, "product_url", None)
+            "product_url": self.product_url_edit.text().strip() or None
         }
@@ -1 +1,55 @@
-DB_FILE = "chemicals.db"
\ No newline at end of file
+DB_FILE = "chemicals.db"
+
+# "wal":  every instance opens the DB read-write; readers run concurrently and
+#         writers are serialized with BEGIN IMMEDIATE + the busy timeout below.
+# "lock": legacy DBLock behaviour - the first instance writes, later ones are
+#         opened read-only while the .lock file exists.
+DB_CONCURRENCY_MODE = "wal"
+DB_BUSY_TIMEOUT_MS = 10000         # how long a writer waits for the write lock
+
+# SQLite tuning applied once per connection by connection.py
+DB_SYNCHRONOUS = "NORMAL"          # NORMAL is durable enough in WAL mode
+DB_CACHE_SIZE_KIB = 20000          # page cache per connection
+DB_MMAP_SIZE = 256 * 1024 * 1024   # set to 0 to disable memory-mapped I/O
+DB_STATEMENT_CACHE_SIZE = 256      # prepared statements kept per connection
+MIGRATION_CHUNK_ROWS = 5000        # rows per committed batch in schema backfills
+LEDGER_RETENTION_DAYS = 365        # older stock movements are folded into snapshots
+
+# Read-only instances ("lock" mode) can read from a local snapshot of the
+# shared database, refreshed in the background with the SQLite backup API.
+REPLICA_ENABLED = True
+REPLICA_PATH = None                # base name, None = chemicals-snapshot.db in the temp dir (source hash + pid are appended)
+REPLICA_REFRESH_SECONDS = 30       # how often to check the source for changes
+REPLICA_PAGES_PER_STEP = 256       # pages copied per backup step
+REPLICA_STEP_SLEEP = 0.01          # pause between steps, lets the writer in
+
+# Main table and search-as-you-type
+SEARCH_DEBOUNCE_MS = 250           # idle time after the last keystroke before searching
+SEARCH_BATCH_ROWS = 2000           # results are handed to the table in batches this size
+# Columns shown in the main table (id is always first).  Wide text columns left
+# out here are loaded only for the selected row, into the detail pane.
+TABLE_COLUMNS = ("id", "name", "cas_number", "formula", "common_name", "location", "quantity",
+                 "manufacturer", "catalog_number")
+TABLE_PAGE_ROWS = 500              # rows fetched per page as the table is scrolled
+EDIT_FLUSH_IDLE_MS = 3000          # inline edits are saved together after this much idle time
+
+# Image preview thumbnails for the entry dialog, cached on disk by content hash
+THUMBNAIL_DIR = None               # None = chemical-thumbnails in the temp dir
+THUMBNAIL_SIZE = 500               # longest edge in pixels
+THUMBNAIL_CACHE_MB = 200           # least recently used thumbnails are evicted above this
+THUMBNAIL_WORKERS = 2              # background threads generating thumbnails during a scan
+
+# OCR engine (see ocr_engine.py)
+OCR_LANGUAGES = ["en"]
+OCR_DEVICE = "auto"                # "auto", "cuda", "mps" or "cpu"
+OCR_TORCH_THREADS = None           # intra-op threads; None = all cores but one (kept for the GUI)
+OCR_TORCH_INTEROP_THREADS = 1      # inter-op threads
+OCR_QUANTIZE_CPU = True            # int8 dynamic quantization of the models when running on CPU
+OCR_WARMUP = True                  # run one small inference when the reader is created
+OCR_WORKERS = 2                    # OCR processes for folder scans, each with its own reader
+OCR_PREFETCH = 4                   # folder scans: images OCR'd ahead of the review dialog
+OCR_CONTRAST_LEVELS = [1.0, 1.5, 2.0, 0.8]  # contrast passes, in the order they are tried
+OCR_SWEEP = "early_exit"           # "early_exit" stops at the first pass with a valid CAS/catalog number; "full" runs all;
+                                   # "two_stage" detects once and recognizes every level in one batch
+OCR_MAX_EDGE = None                # cap the long edge passed to OCR, e.g. 1600 (JPEGs decoded at reduced scale); None = full size
+OCR_LABEL_CROP = False             # crop to the densest text region (the label) before OCR
@@ -0,0 +1,106 @@
+import sqlite3
+import threading
+import atexit
+from contextlib import contextmanager
+from config import (DB_FILE, DB_SYNCHRONOUS, DB_CACHE_SIZE_KIB, DB_MMAP_SIZE,
+                    DB_STATEMENT_CACHE_SIZE, DB_BUSY_TIMEOUT_MS)
+
+#====SHARED CONNECTION MANAGER====#
+# One long-lived connection per (thread, database URI).  Opening a connection
+# and applying PRAGMAs is the expensive part on a network drive, and keeping the
+# connection alive also keeps sqlite3's prepared-statement cache warm.
+
+_local = threading.local()
+_registry = []  # every connection opened, so they can be closed at exit
+_registry_lock = threading.Lock()
+_generation = 0  # bumped by close_all() so threads drop closed connections
+_default_uri = DB_FILE
+
+
+def configure(db_uri):
+    """Set the database URI used when callers don't pass one explicitly."""
+    global _default_uri
+    if db_uri != _default_uri:
+        close_all()
+    _default_uri = db_uri
+
+
+def default_uri():
+    return _default_uri
+
+
+def is_readonly(db_uri):
+    """True for URIs such as file:chemicals.db?mode=ro built by main.py."""
+    return db_uri.startswith("file:") and "mode=ro" in db_uri.partition("?")[2]
+
+
+def get_connection(db_uri=None):
+    """
+    Return this thread's connection to db_uri (default: the configured URI).
+    Use it as `with get_connection() as conn:` to commit or roll back; the
+    connection itself stays open.
+    """
+    db_uri = db_uri or _default_uri
+    connections = getattr(_local, "connections", None)
+    if connections is None or _local.generation != _generation:
+        connections = _local.connections = {}
+        _local.generation = _generation
+    conn = connections.get(db_uri)
+    if conn is None:
+        conn = connections[db_uri] = _open(db_uri)
+    return conn
+
+
+def _open(db_uri):
+    # check_same_thread is off only so close_all() can run from the main thread;
+    # each connection is still handed out to a single thread.
+    conn = sqlite3.connect(db_uri, uri=True, check_same_thread=False,
+                           timeout=DB_BUSY_TIMEOUT_MS / 1000,
+                           cached_statements=DB_STATEMENT_CACHE_SIZE)
+    if not is_readonly(db_uri):
+        # journal mode is persistent, so this only does work the first time
+        conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = {-int(DB_CACHE_SIZE_KIB)}")
+    conn.execute(f"PRAGMA mmap_size = {int(DB_MMAP_SIZE)}")
+    with _registry_lock:
+        _registry.append(conn)
+    return conn
+
+
+@contextmanager
+def write_transaction(db_uri=None):
+    """
+    Run a block of writes as one transaction that holds the write lock from the
+    start (BEGIN IMMEDIATE).  Concurrent writers queue on the busy timeout
+    instead of failing halfway through with SQLITE_BUSY; WAL readers are never
+    blocked.  Nested use joins the outer transaction.
+    """
+    conn = get_connection(db_uri)
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def close_all():
+    """Close every connection opened by this module (all threads)."""
+    global _generation
+    with _registry_lock:
+        connections = list(_registry)
+        _registry.clear()
+        _generation += 1
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error closing connection: {e}")
+
+
+atexit.register(close_all)
@@ -1,14 +1,18 @@
-import sqlite3
-from config import DB_FILE
+from connection import write_transaction
+from migrations import run_migrations
+from repository import get_repository
 
 #====DB creation ====#
-def create_database(db_uri, readonly) :
+def create_database(db_uri, readonly, progress=None) :
     """
-    Create a SQLite database and a 'chemicals' table if it doesn't already exist.
+    Create a SQLite database and a 'chemicals' table if it doesn't already exist,
+    then bring the schema up to date (see migrations.py).
     Stores the chemical database
     """
-    # using context manager ensures the connection is closed even on error
-    with sqlite3.connect(db_uri, uri=True) as conn:
+    if readonly:
+        return
+    # commits on success and rolls back on error
+    with write_transaction(db_uri) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS Chemicals (
@@ -26,102 +30,24 @@ def create_database(db_uri, readonly) :
                 product_url TEXT
             )
         ''')
+    run_migrations(db_uri, readonly=readonly, progress=progress)
 #==============================#
 
-def normalize(s):
-    return s.strip().lower() if s else None
+# Module-level shortcuts onto the shared ChemicalRepository, for scripts and
+# headless imports that don't hold a repository themselves.
 
-def save_to_database(info):
-    # context manager automatically commits (unless an exception occurs) and closes
-    with sqlite3.connect(DB_FILE) as conn:
-        cursor = conn.cursor()
-
-        # Normalize incoming values
-        name = normalize(info.get("name"))
-        common_name = normalize(info.get("common_name"))
-        cas_number = normalize(info.get("cas_number"))
-        catalog_number = normalize(info.get("catalog_number"))
-
-        existing = None
-
-        # Priority 1: Match by CAS number
-        if cas_number:
-            cursor.execute('''
-                SELECT id, quantity FROM Chemicals
-                WHERE LOWER(cas_number) = ?
-            ''', (cas_number,))
-            existing = cursor.fetchone()
-
-        # Priority 2: Match by catalog number
-        if not existing and catalog_number:
-            cursor.execute('''
-                SELECT id, quantity FROM Chemicals
-                WHERE LOWER(catalog_number) = ?
-            ''', (catalog_number,))
-            existing = cursor.fetchone()
-
-        # Priority 3: Match name when common_name is empty
-        if not existing and name:
-            cursor.execute('''
-                SELECT id, quantity FROM Chemicals
-                WHERE LOWER(name) = ?
-                AND (common_name IS NULL OR TRIM(common_name) = '')
-            ''', (name,))
-            existing = cursor.fetchone()
-
-        # Priority 4: Match common_name when name is empty
-        if not existing and common_name:
-            cursor.execute('''
-                SELECT id, quantity FROM Chemicals
-                WHERE LOWER(common_name) = ?
-                AND (name IS NULL OR TRIM(name) = '')
-            ''', (common_name,))
-            existing = cursor.fetchone()
+def save_to_database(info, db_uri=None):
+    """Insert or merge a single entry.  Returns ("inserted" | "merged", id)."""
+    return get_repository(db_uri).save(info)
 
-        # Priority 5: common_name matches existing name, and their common_name is empty
-        if not existing and common_name:
-            cursor.execute('''
-                SELECT id, quantity FROM Chemicals
-                WHERE LOWER(name) = ?
-                AND (common_name IS NULL OR TRIM(common_name) = '')
-            ''', (common_name,))
-            existing = cursor.fetchone()
+def save_many_to_database(infos, db_uri=None):
+    """Insert or merge a batch of entries in one transaction; see ChemicalRepository.save_many."""
+    return get_repository(db_uri).save_many(infos)
 
-        # Priority 6: name matches existing common_name, and their name is empty
-        if not existing and name:
-            cursor.execute('''
-                SELECT id, quantity FROM Chemicals
-                WHERE LOWER(common_name) = ?
-                AND (name IS NULL OR TRIM(name) = '')
-            ''', (name,))
-            existing = cursor.fetchone()
+def decrement_quantity(ids, amount=1, db_uri=None):
+    """Atomically take `amount` from each chemical; see ChemicalRepository.decrement."""
+    return get_repository(db_uri).decrement(ids, amount)
 
-        # Merge if match found
-        if existing:
-            existing_id, existing_qty = existing
-            new_qty = existing_qty + info.get("quantity", 1)
-            cursor.execute('''
-                UPDATE Chemicals
-                SET quantity = ?
-                WHERE id = ?
-            ''', (new_qty, existing_id))
-        else:
-            # Insert new row
-            cursor.execute('''
-                INSERT INTO Chemicals (
-                    name, cas_number, formula, common_name, iupac_name, location, quantity,
-                    safety_info_url, manufacturer, catalog_number, product_url
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                info.get("name"),
-                info.get("cas_number"),
-                info.get("formula"),
-                info.get("common_name"),
-                info.get("iupac_name"),
-                info.get("location"),
-                info.get("quantity", 1),
-                info.get("safety_info_url"),
-                info.get("manufacturer"),
-                info.get("catalog_number"),
-                info.get("product_url"),
-            ))
+def search_chemicals(query_text, db_uri=None):
+    """Chemicals matching query_text, best matches first; see ChemicalRepository.search."""
+    return get_repository(db_uri).search(query_text)
@@ -0,0 +1,61 @@
+import queue
+import threading
+from concurrent.futures import Future
+from PyQt5.QtCore import QObject, pyqtSignal
+
+#====BACKGROUND DATABASE WRITER====#
+# Every write the GUI starts goes through one writer thread, in the order it
+# was submitted, so a slow or locked database file never blocks the event
+# loop.  submit() returns a concurrent.futures.Future; the optional on_done /
+# on_error callbacks run back on the GUI thread (delivered through a queued
+# Qt signal), which is where the window applies or rolls back its optimistic
+# table updates.  The writer uses its own connection from connection.py.
+
+
+class DatabaseWriter(QObject):
+    _completed = pyqtSignal(object, object, object)  # future, on_done, on_error
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = queue.Queue()
+        self._completed.connect(self._dispatch)
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """Queue fn(*args) for the writer thread and return its Future."""
+        future = Future()
+        self._queue.put((future, fn, args, on_done, on_error))
+        return future
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def stop(self):
+        """Finish every queued write, then end the thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            future, fn, args, on_done, on_error = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            self._completed.emit(future, on_done, on_error)
+
+    def _dispatch(self, future, on_done, on_error):
+        error = future.exception()
+        if error is None:
+            if on_done is not None:
+                on_done(future.result())
+        elif on_error is not None:
+            on_error(error)
+        else:
+            print(f"Database write failed: {error}")
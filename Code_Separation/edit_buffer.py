@@ -0,0 +1,56 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from config import EDIT_FLUSH_IDLE_MS
+
+#====INLINE EDIT BUFFER====#
+# Inline cell edits are held as pending in the table model and saved together:
+# after EDIT_FLUSH_IDLE_MS without a new edit, on an explicit Save, or before
+# any other write.  Each flush is one update_fields() transaction on the
+# DatabaseWriter, so editing 200 locations costs one commit instead of 200.
+# If the transaction fails nothing was written, so the whole batch is dropped
+# from the model and the cells show the stored values again.
+
+
+class EditBuffer(QObject):
+    failed = pyqtSignal(object)  # the exception of a batch that was rolled back
+
+    def __init__(self, model, repo, writer, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.repo = repo
+        self.writer = writer
+        self._in_flight = set()  # edits submitted but not yet committed
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(EDIT_FLUSH_IDLE_MS)
+        self._timer.timeout.connect(self.flush)
+        model.pending_changed.connect(self._on_pending_changed)
+
+    def _on_pending_changed(self, count):
+        if count:
+            self._timer.start()  # restart the idle period
+        else:
+            self._timer.stop()
+
+    def flush(self):
+        """Save every pending edit not already on its way, in one transaction."""
+        self._timer.stop()
+        edits = [edit for edit in self.model.pending_edits() if edit not in self._in_flight]
+        if not edits:
+            return None
+        self._in_flight.update(edits)
+        return self.writer.submit(self.repo.update_fields, edits,
+                                  on_done=lambda _: self._settle(edits, saved=True),
+                                  on_error=lambda e: self._settle(edits, saved=False, error=e))
+
+    def discard(self):
+        """Throw away the edits that have not been submitted yet."""
+        self._timer.stop()
+        self.model.discard_pending([edit for edit in self.model.pending_edits() if edit not in self._in_flight])
+
+    def _settle(self, edits, saved, error=None):
+        self._in_flight.difference_update(edits)
+        if saved:
+            self.model.commit_pending(edits)
+        else:
+            self.model.discard_pending(edits)
+            self.failed.emit(error)
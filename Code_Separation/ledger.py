@@ -0,0 +1,36 @@
+from repository import get_repository, RECEIVE, MERGE, USE, EDIT, TRANSFER, DELETE, OPENING
+
+#====STOCK MOVEMENT LEDGER====#
+# Every change to Chemicals.quantity is also appended to stock_movements, so
+# consumption can be analysed over time; a location change is booked as a
+# transfer out of the old location and into the new one.  Chemicals.quantity
+# stays the materialized current balance (an O(1) primary-key read); the
+# ledger is the history behind it.  compact_movements() folds old movements into
+# stock_snapshots so the ledger does not grow without bound, keeping
+#   snapshot balance + SUM(later movements) == quantity
+# for every chemical and location.
+
+
+def movements_for_chemical(chemical_id, start=None, end=None, db_uri=None):
+    """Movements of one chemical with start <= created_at < end (ISO-8601 UTC strings)."""
+    return get_repository(db_uri).movements_for_chemical(chemical_id, start, end)
+
+
+def movements_for_location(location, start=None, end=None, db_uri=None):
+    """Movements recorded at one location with start <= created_at < end."""
+    return get_repository(db_uri).movements_for_location(location, start, end)
+
+
+def compact_movements(before, db_uri=None):
+    """Fold movements older than `before` into stock_snapshots; returns how many."""
+    return get_repository(db_uri).compact_movements(before)
+
+
+def compact_older_than(days, db_uri=None):
+    """Periodic job: compact movements older than `days` days."""
+    repo = get_repository(db_uri)
+    before = repo.timestamp_days_ago(days)
+    folded = repo.compact_movements(before)
+    if folded:
+        print(f"🗜️ Compacted {folded} stock movements older than {before}.")
+    return folded
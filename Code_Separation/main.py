@@ -4,21 +4,65 @@ from styles import jetbrains_font, dark_stylesheet
 from database import create_database
 from ui_mainwindow import MainWindow
 from login_dialog import LoginDialog
-from PyQt5.QtWidgets import QDialog
+from PyQt5.QtWidgets import QDialog, QProgressDialog
 from dblock import DBLock
-from config import DB_FILE
+from config import DB_FILE, DB_CONCURRENCY_MODE, LEDGER_RETENTION_DAYS, REPLICA_ENABLED
+from replica import SnapshotReplica
+from ledger import compact_older_than
+import connection
+
+
+class MigrationProgress:
+    """Progress callback for create_database; shows a dialog during long backfills."""
+    def __init__(self):
+        self.dialog = None
+
+    def __call__(self, migration, done, total):
+        if self.dialog is None:
+            self.dialog = QProgressDialog("Updating database...", None, 0, 100)
+            self.dialog.setWindowTitle("Database Upgrade")
+            self.dialog.setMinimumDuration(500)
+        self.dialog.setLabelText(f"Updating database: {migration.description}")
+        self.dialog.setValue(int(done * 100 / max(total, 1)))
+        QApplication.processEvents()
+
+    def close(self):
+        if self.dialog is not None:
+            self.dialog.close()
+
 
 if __name__ == "__main__":
-    locker = DBLock(DB_FILE)
-    readonly = locker.acquire()
+    if DB_CONCURRENCY_MODE == "lock":
+        # legacy: only the first instance may write
+        locker = DBLock(DB_FILE)
+        readonly = locker.acquire()
+    else:
+        # WAL: every instance reads concurrently, writes queue on the busy timeout
+        readonly = False
     # Use this URI if opening SQLite in read-only mode
+    replica = None
     if readonly:
         db_uri = f"file:{DB_FILE}?mode=ro"
+        if REPLICA_ENABLED:
+            # read from a local copy so we don't compete with the writer for I/O
+            replica = SnapshotReplica(db_uri)
+            try:
+                replica.start()
+                db_uri = replica.uri
+            except (RuntimeError, OSError) as e:
+                # the snapshot is only an optimisation; read the shared file directly
+                print(f"⚠️ Local snapshot unavailable, reading the shared database: {e}")
+                replica = None
     else:
         db_uri = DB_FILE
+    connection.configure(db_uri)
 
-    create_database(db_uri, readonly=readonly)
     app = QApplication(sys.argv)
+    migration_progress = MigrationProgress()
+    create_database(db_uri, readonly=readonly, progress=migration_progress)
+    migration_progress.close()
+    if not readonly:
+        compact_older_than(LEDGER_RETENTION_DAYS)
     # Show login dialog
     login_dialog = LoginDialog(allow_password_change=True)
     if login_dialog.exec_() != QDialog.Accepted:
@@ -28,6 +72,6 @@ if __name__ == "__main__":
     app.setFont(jetbrains_font)
     app.setStyleSheet(dark_stylesheet)
 
-    window = MainWindow(db_uri)
+    window = MainWindow(db_uri, replica=replica)
     window.show()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,276 @@
+import sqlite3
+import time
+from connection import get_connection, write_transaction
+from config import MIGRATION_CHUNK_ROWS
+
+#====SCHEMA MIGRATIONS====#
+# The schema version lives in PRAGMA user_version.  Each migration runs as:
+#   1. schema   - DDL in one transaction (columns, triggers, virtual tables)
+#   2. backfill - optional UPDATE/INSERT over existing rows, committed in id
+#                 ranges of MIGRATION_CHUNK_ROWS so the write lock is released
+#                 between chunks and other instances stay usable
+#   3. finalize - index builds plus the user_version bump, in one transaction
+# Triggers are created in step 1, so rows written while the backfill runs are
+# kept current; the backfill only covers ids that existed when it started.
+# Every step is idempotent: it is safe to re-run if the app stops halfway, and
+# when a second instance starts during a long backfill (user_version is only
+# bumped in step 3) and runs the same steps over the first one's work.
+
+# Normalized lookup keys used by save_to_database.  They are kept in sync by
+# triggers so every writer (inline edits included) updates them, and indexed
+# so the merge rules resolve with index lookups instead of table scans.
+MATCH_KEY_COLUMNS = {
+    "cas_key": "cas_number",
+    "catalog_key": "catalog_number",
+    "name_key": "name",
+    "common_key": "common_name",
+}
+
+# Columns indexed for full-text search, with their bm25 weights
+SEARCH_COLUMNS = {
+    "name": 10.0,
+    "common_name": 8.0,
+    "iupac_name": 3.0,
+    "cas_number": 10.0,
+    "catalog_number": 10.0,
+    "manufacturer": 2.0,
+    "location": 2.0,
+}
+
+# Sort expressions for the table's keyset pages: NULLs become '' (or 0) so the
+# last row's key can be compared.  Indexed where the table is sorted by default.
+SORT_KEYS = {"id": "id", "quantity": "IFNULL(quantity, 0)"}
+SORT_INDEXED = ("name",)
+
+
+def sort_key(column):
+    return SORT_KEYS.get(column, f"IFNULL({column}, '')")
+
+
+def _key_expr(column):
+    """
+    SQL expression for the stored match keys: spaces trimmed, ASCII lower-cased,
+    '' -> NULL.  repository.normalize() must compute exactly the same key.
+    """
+    return f"NULLIF(LOWER(TRIM({column})), '')"
+
+
+def _key_assignments(prefix):
+    return ", ".join(f"{key} = {_key_expr(prefix + col)}" for key, col in MATCH_KEY_COLUMNS.items())
+
+
+class Migration:
+    def __init__(self, version, description, schema=None, backfill=None, finalize=None):
+        self.version = version
+        self.description = description
+        self.schema = schema      # callable(cursor)
+        self.backfill = backfill  # SQL with (low, high] id placeholders
+        self.finalize = finalize  # callable(cursor)
+
+
+# ---- 1: normalized match keys ----
+def _match_keys_schema(cursor):
+    cursor.execute("PRAGMA table_info(Chemicals)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    for key in MATCH_KEY_COLUMNS:
+        if key not in existing_columns:
+            cursor.execute(f"ALTER TABLE Chemicals ADD COLUMN {key} TEXT")
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS chemicals_match_keys_ai AFTER INSERT ON Chemicals
+        BEGIN
+            UPDATE Chemicals SET {_key_assignments('new.')} WHERE id = new.id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS chemicals_match_keys_au
+        AFTER UPDATE OF name, common_name, cas_number, catalog_number ON Chemicals
+        BEGIN
+            UPDATE Chemicals SET {_key_assignments('new.')} WHERE id = new.id;
+        END
+    ''')
+
+
+def _match_keys_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chemicals_cas_key ON Chemicals(cas_key)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chemicals_catalog_key ON Chemicals(catalog_key)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chemicals_name_key ON Chemicals(name_key, common_key)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chemicals_common_key ON Chemicals(common_key, name_key)")
+
+
+# ---- 2: full-text search index ----
+def _search_index_schema(cursor):
+    """
+    Create the chemicals_fts external-content index and its sync triggers.
+    The index is filled by the 'rebuild' in finalize, not by a chunked
+    backfill: rebuild reads the whole content table in one transaction, so
+    running it twice (or after an interrupted run) leaves no duplicates.
+    """
+    cols = ", ".join(SEARCH_COLUMNS)
+    new_cols = ", ".join("new." + c for c in SEARCH_COLUMNS)
+    old_cols = ", ".join("old." + c for c in SEARCH_COLUMNS)
+
+    cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS chemicals_fts USING fts5(
+            {cols},
+            content='Chemicals', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS chemicals_fts_ai AFTER INSERT ON Chemicals BEGIN
+            INSERT INTO chemicals_fts(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS chemicals_fts_ad AFTER DELETE ON Chemicals BEGIN
+            INSERT INTO chemicals_fts(chemicals_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS chemicals_fts_au AFTER UPDATE OF {cols} ON Chemicals BEGIN
+            INSERT INTO chemicals_fts(chemicals_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO chemicals_fts(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+    ''')
+
+
+def _search_index_build(cursor):
+    cursor.execute("INSERT INTO chemicals_fts(chemicals_fts) VALUES ('rebuild')")
+    cursor.execute("INSERT INTO chemicals_fts(chemicals_fts) VALUES ('optimize')")
+
+
+# ---- 3: stock movement ledger ----
+def _ledger_schema(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stock_movements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chemical_id INTEGER NOT NULL,
+            location TEXT NOT NULL DEFAULT '',
+            delta INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stock_snapshots (
+            chemical_id INTEGER NOT NULL,
+            location TEXT NOT NULL DEFAULT '',
+            balance INTEGER NOT NULL,
+            as_of TEXT NOT NULL,
+            PRIMARY KEY (chemical_id, location)
+        )
+    ''')
+    # the backfill checks for an existing opening row per chemical; index it now
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_movements_chemical ON stock_movements(chemical_id, created_at)")
+
+
+def _ledger_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_movements_chemical ON stock_movements(chemical_id, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_movements_location ON stock_movements(location, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_movements_created ON stock_movements(created_at)")
+
+
+# ---- 4: keyset paging ----
+def _sort_indexes(cursor):
+    for column in SORT_INDEXED:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_chemicals_sort_{column} ON Chemicals({sort_key(column)})")
+
+
+MIGRATIONS = [
+    Migration(
+        1, "normalized match keys",
+        schema=_match_keys_schema,
+        backfill=f"UPDATE Chemicals SET {_key_assignments('')} WHERE id > ? AND id <= ?",
+        finalize=_match_keys_indexes,
+    ),
+    Migration(
+        2, "full-text search index",
+        schema=_search_index_schema,
+        finalize=_search_index_build,
+    ),
+    Migration(
+        3, "stock movement ledger",
+        schema=_ledger_schema,
+        # existing quantities become the opening balance of each chemical (once)
+        backfill='''
+            INSERT INTO stock_movements (chemical_id, location, delta, reason)
+            SELECT c.id, IFNULL(c.location, ''), c.quantity, 'opening' FROM Chemicals c
+            WHERE c.id > ? AND c.id <= ? AND c.quantity != 0
+              AND NOT EXISTS (SELECT 1 FROM stock_movements m
+                              WHERE m.chemical_id = c.id AND m.reason = 'opening')
+        ''',
+        finalize=_ledger_indexes,
+    ),
+    Migration(4, "table sort index", finalize=_sort_indexes),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(db_uri=None):
+    return get_connection(db_uri).execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(db_uri=None):
+    current = schema_version(db_uri)
+    return [m for m in MIGRATIONS if m.version > current]
+
+
+def run_migrations(db_uri=None, readonly=False, progress=None):
+    """
+    Apply every migration newer than PRAGMA user_version, in order.
+
+    progress, if given, is called as progress(migration, rows_done, rows_total)
+    after each backfill chunk so a GUI can update and process events.
+    Returns a list of (version, step, seconds) timings; read-only databases are
+    left untouched and return an empty list.
+    """
+    if readonly:
+        return []
+
+    timings = []
+    for migration in pending_migrations(db_uri):
+        label = f"migration {migration.version} ({migration.description})"
+
+        start = time.perf_counter()
+        with write_transaction(db_uri) as conn:
+            # another instance may have applied it while we waited for the lock
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= migration.version:
+                continue
+            low, high = conn.execute("SELECT IFNULL(MIN(id) - 1, 0), IFNULL(MAX(id), 0) FROM Chemicals").fetchone()
+            skip_rest = False
+            if migration.schema:
+                try:
+                    migration.schema(conn.cursor())
+                except sqlite3.OperationalError as e:
+                    # e.g. FTS5 missing from this SQLite build; the app falls back
+                    print(f"⚠️ {label} skipped: {e}")
+                    skip_rest = True
+        timings.append((migration.version, "schema", time.perf_counter() - start))
+
+        if migration.backfill and not skip_rest:
+            start = time.perf_counter()
+            total = high - low
+            done = low
+            while done < high:
+                with write_transaction(db_uri) as conn:
+                    conn.execute(migration.backfill, (done, min(done + MIGRATION_CHUNK_ROWS, high)))
+                done = min(done + MIGRATION_CHUNK_ROWS, high)
+                if progress:
+                    progress(migration, done - low, total)
+            timings.append((migration.version, "backfill", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        with write_transaction(db_uri) as conn:
+            # an instance started during our backfill may have finished it first
+            if conn.execute("PRAGMA user_version").fetchone()[0] < migration.version:
+                if migration.finalize and not skip_rest:
+                    migration.finalize(conn.cursor())
+                # PRAGMA does not accept parameters; version is an int from MIGRATIONS
+                conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+        timings.append((migration.version, "finalize", time.perf_counter() - start))
+
+        steps = ", ".join(f"{step} {secs:.2f}s" for v, step, secs in timings if v == migration.version)
+        print(f"✅ Applied {label}: {steps}")
+    return timings
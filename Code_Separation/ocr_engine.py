@@ -0,0 +1,76 @@
+import os
+import time
+from config import (OCR_LANGUAGES, OCR_DEVICE, OCR_TORCH_THREADS, OCR_TORCH_INTEROP_THREADS,
+                    OCR_QUANTIZE_CPU, OCR_WARMUP)
+
+#====OCR ENGINE FACTORY====#
+# Builds the EasyOCR reader from the OCR_* settings in config.py instead of a
+# hard-coded gpu=True: picks the device, caps torch's thread pools so OCR
+# leaves a core for the GUI, optionally int8-quantizes the models on CPU and
+# runs one warm-up inference so the first real scan isn't the slow one.
+# The settings actually applied are returned with the reader (and printed),
+# because several of them are only requests that torch may not honour.
+
+
+def pick_device(requested=OCR_DEVICE):
+    import torch
+    if requested != "auto":
+        return requested
+    if torch.cuda.is_available():
+        return "cuda"
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def configure_threads(intra=OCR_TORCH_THREADS, inter=OCR_TORCH_INTEROP_THREADS):
+    """Apply torch thread counts; returns the counts in effect."""
+    import torch
+    if intra is None:
+        intra = max(1, (os.cpu_count() or 2) - 1)
+    torch.set_num_threads(intra)
+    if inter is not None:
+        try:
+            torch.set_interop_threads(inter)
+        except RuntimeError:
+            pass  # only settable before torch's first parallel work; keep what is in effect
+    return torch.get_num_threads(), torch.get_num_interop_threads()
+
+
+def _warmup_image():
+    from PIL import Image, ImageDraw
+    import numpy as np
+    image = Image.new("RGB", (320, 64), "white")
+    ImageDraw.Draw(image).text((10, 20), "CAS 64-17-5 Cat. E7023", fill="black")
+    return np.array(image)
+
+
+def create_reader(device=OCR_DEVICE, threads=OCR_TORCH_THREADS, interop_threads=OCR_TORCH_INTEROP_THREADS,
+                  quantize=OCR_QUANTIZE_CPU, warmup=OCR_WARMUP, languages=OCR_LANGUAGES):
+    """Return (reader, settings) where settings records what was actually used."""
+    import easyocr
+    import torch
+    started = time.perf_counter()
+    device = pick_device(device)
+    intra, inter = configure_threads(threads, interop_threads)
+    quantized = quantize and device == "cpu"
+    reader = easyocr.Reader(languages, gpu=False if device == "cpu" else device, quantize=quantized,
+                            verbose=False)
+    settings = {
+        "device": device,
+        "threads": intra,
+        "interop_threads": inter,
+        "quantized": quantized,
+        "languages": list(languages),
+        "torch": torch.__version__,
+        "easyocr": getattr(easyocr, "__version__", "?"),
+        "load_s": round(time.perf_counter() - started, 2),
+        "warmup_s": None,
+    }
+    if warmup:
+        started = time.perf_counter()
+        reader.readtext(_warmup_image())
+        settings["warmup_s"] = round(time.perf_counter() - started, 2)
+    print("✅ OCR engine ready: " + ", ".join(f"{k}={v}" for k, v in settings.items()))
+    return reader, settings
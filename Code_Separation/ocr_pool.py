@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PyQt5.QtCore import QObject, QEventLoop, pyqtSignal
+from config import OCR_WORKERS, OCR_TORCH_THREADS, OCR_PREFETCH
+
+#====OCR PROCESS POOL====#
+# Folder scans OCR several images at once in separate processes, each with
+# its own EasyOCR reader: one shared reader in threads is serialized by the
+# GIL and torch.  Each worker gets an equal share of the torch threads so the
+# pool as a whole still leaves a core for the GUI.  Workers are started (and
+# their models loaded) when the first scan begins and stay up for later scans.
+# Results are reported through Qt signals on the GUI thread as soon as each
+# image finishes, in whatever order they finish.
+
+
+def _init_worker(threads):
+    import ocr_utils
+    from ocr_engine import create_reader
+    ocr_utils._reader, ocr_utils.engine_settings = create_reader(threads=threads)
+
+
+def _warm():
+    """Returns the worker's ocr_utils.engine_settings (what create_reader applied)."""
+    import ocr_utils
+    return ocr_utils.engine_settings
+
+
+def scan_image(image_path):
+    """OCR + parse one image (runs in a worker).  Returns (text, parsed_info, OCR passes)."""
+    from ocr_utils import extract_text_from_image, parse_chemical_info, sweep_stats
+    passes = sweep_stats["passes"]
+    text = extract_text_from_image(image_path)
+    passes = sweep_stats["passes"] - passes  # sweep_stats counts this worker's passes only
+    return text, parse_chemical_info(text), passes  # no browser side-effect by default
+
+
+class OcrPool(QObject):
+    result_ready = pyqtSignal(str, str, dict, int)  # image path, OCR text, parsed info, OCR passes
+    failed = pyqtSignal(str, str)              # image path, error
+    _completed = pyqtSignal(str, object, int)  # image path, future, executor generation (from the pool's thread)
+
+    def __init__(self, workers=OCR_WORKERS, parent=None):
+        super().__init__(parent)
+        self.workers = max(1, workers)
+        total_threads = OCR_TORCH_THREADS or max(1, (os.cpu_count() or 2) - 1)
+        self.threads_per_worker = max(1, total_threads // self.workers)
+        self._executor = None
+        self._generation = 0  # bumped for every new executor
+        self.engine_settings = None  # the readers are built in the workers; set once one is up
+        self._completed.connect(self._deliver)
+
+    def start(self):
+        """
+        Start the workers and begin loading their readers; returns immediately
+        with futures that finish once the workers are up (empty if already started).
+        """
+        if self._executor is not None:
+            return []
+        self._generation += 1
+        self._executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker, initargs=(self.threads_per_worker,))
+        # one trivial task per worker makes the pool spawn them all now
+        futures = [self._executor.submit(_warm) for _ in range(self.workers)]
+        for future in futures:
+            future.add_done_callback(self._worker_ready)
+        return futures
+
+    def _worker_ready(self, future):
+        if not future.cancelled() and future.exception() is None:
+            self.engine_settings = future.result()
+
+    def submit(self, image_path):
+        """Queue one image; its result arrives through result_ready / failed.  Returns the Future."""
+        self.start()
+        try:
+            future = self._executor.submit(scan_image, image_path)
+        except BrokenProcessPool:
+            # a worker died since the last scan; start over with fresh workers
+            self.shutdown()
+            self.start()
+            future = self._executor.submit(scan_image, image_path)
+        generation = self._generation
+        future.add_done_callback(lambda f: self._completed.emit(image_path, f, generation))
+        return future
+
+    def _deliver(self, image_path, future, generation):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            text, info, passes = future.result()
+            self.result_ready.emit(image_path, text, info, passes)
+            return
+        if isinstance(error, BrokenProcessPool) and generation == self._generation:
+            self.shutdown()  # a worker crashed; the next submit() starts a new pool
+        self.failed.emit(image_path, str(error))
+
+    def wait(self, future):
+        """Block until future is done while keeping the GUI responsive; returns its result."""
+        if not future.done():
+            # submit()'s done callback emits _completed, which ends each exec_()
+            loop = QEventLoop()
+            self._completed.connect(loop.quit)
+            while not future.done():
+                loop.exec_()
+            self._completed.disconnect(loop.quit)
+        return future.result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class FolderScan:
+    """
+    Yields (image_path, text, parsed_info) in folder order for the review
+    dialogs, keeping at most `ahead` images queued or finished on the pool
+    beyond the one being reviewed.  Whenever a result is taken the next image
+    is submitted, so OCR (and the PubChem lookup in parse_chemical_info) runs
+    while the user reads the dialog, but a large folder never floods the pool
+    or holds every result in memory.  cancel() drops the images not started yet.
+    images / passes count the images OCR'd so far and the OCR passes they took
+    (see average_passes()).
+    """
+    def __init__(self, pool, image_paths, ahead=OCR_PREFETCH):
+        self.pool = pool
+        self.ahead = max(1, ahead)
+        self.cancelled = False
+        self._paths = deque(image_paths)
+        self._queued = deque()  # (image_path, future), oldest first
+        self.images = 0
+        self.passes = 0
+
+    def _fill(self):
+        while self._paths and len(self._queued) < self.ahead and not self.cancelled:
+            image_path = self._paths.popleft()
+            try:
+                future = self.pool.submit(image_path)
+            except BrokenProcessPool as e:
+                # the replacement pool died too; this image is reported as failed in __iter__
+                future = Future()
+                future.set_exception(e)
+            self._queued.append((image_path, future))
+
+    def __iter__(self):
+        self._fill()
+        while self._queued and not self.cancelled:
+            image_path, future = self._queued.popleft()
+            self._fill()  # keep the workers busy while this result is reviewed
+            try:
+                text, parsed_info, passes = self.pool.wait(future)
+                self.images += 1
+                self.passes += passes
+            except Exception as e:
+                if self.cancelled:
+                    return
+                print(f"OCR failed for {image_path}: {e}")
+                text, parsed_info = "", {}
+            if self.cancelled:
+                return
+            yield image_path, text, parsed_info
+
+    def average_passes(self):
+        """Mean OCR passes per image read so far (0 before the first)."""
+        return self.passes / self.images if self.images else 0
+
+    def cancel(self):
+        """Stop the scan; queued images are cancelled, running ones finish and are ignored."""
+        self.cancelled = True
+        self._paths.clear()
+        for _, future in self._queued:
+            future.cancel()
+        self._queued.clear()
@@ -1,13 +1,34 @@
-from PIL import Image, ImageEnhance
-import easyocr
-import pubchempy as pcp
-import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter, ImageOps
 import re
+import threading
 import webbrowser
 import urllib.parse
+from config import OCR_CONTRAST_LEVELS, OCR_SWEEP, OCR_MAX_EDGE, OCR_LABEL_CROP
 
+# easyocr (which pulls in torch) and pubchempy are imported on first use, and
+# the OCR model is only loaded when a scan starts - launching the app to look
+# up stock never pays for them.
+_reader = None
+_reader_lock = threading.Lock()
+engine_settings = None  # what ocr_engine.create_reader() applied in this process (an OCR worker, see ocr_pool)
+sweep_stats = {"images": 0, "passes": 0}  # contrast passes run in this process
 
-reader = easyocr.Reader(['en'], gpu=True)  # optical character recognition system
+
+def get_reader():
+    """The shared EasyOCR reader, loaded on first call (blocks until ready)."""
+    global _reader, engine_settings
+    with _reader_lock:
+        if _reader is None:
+            from ocr_engine import create_reader
+            _reader, engine_settings = create_reader()  # optical character recognition system
+        return _reader
+
+
+def __getattr__(name):
+    # ocr_utils.reader used to be a module-level Reader
+    if name == "reader":
+        return get_reader()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # compiled patterns for reuse
 CAS_PATTERN = re.compile(r"\b(\d{2,7}-\d{2}-\d)\b")
@@ -15,29 +36,134 @@ CATALOG_PATTERN = re.compile(
     r"\b(?:Catalog|Catalogue|Cat(?:\.|alog(?:ue)?)?)?\s*(?:No\.?|Number)?\s*[:#]?\s*([A-Z]?\d{4,}[A-Z]?)\b",
     re.IGNORECASE
 )
+# catalog number behind an explicit "Cat. No." / "Catalog Number" / "Cat#" label
+LABELLED_CATALOG_PATTERN = re.compile(
+    r"\b(?:Cat(?:alog(?:ue)?)?\.?\s*(?:No\.?|Number|#)|Catalog(?:ue)?|Cat\.)\s*[:#]?\s*([A-Z]?\d{4,}[A-Z]?)\b",
+    re.IGNORECASE
+)
+
+
+def is_valid_cas(cas):
+    """CAS check digit: digits before it weighted 1, 2, 3... from the right, mod 10."""
+    digits = cas.replace("-", "")
+    body, check = digits[:-1], digits[-1]
+    return sum(i * int(d) for i, d in enumerate(reversed(body), 1)) % 10 == int(check)
+
+
+def has_identifier(text):
+    """
+    True if text holds a checksum-valid CAS number or an explicitly labelled
+    catalog number ("Cat. No. 12345"); bare digit runs such as lot numbers or
+    dates do not count.
+    """
+    return (any(is_valid_cas(cas) for cas in CAS_PATTERN.findall(text))
+            or LABELLED_CATALOG_PATTERN.search(text) is not None)
+
+
+def average_passes():
+    """Mean contrast passes per image so far in this process (0 before any scan)."""
+    return sweep_stats["passes"] / sweep_stats["images"] if sweep_stats["images"] else 0
+
+
+# ====PREPROCESSING====#
+def prepare_image(image_path, max_edge=None, label_crop=None):
+    """
+    Open a photo for OCR: JPEGs are decoded at a reduced scale (PIL draft),
+    EXIF rotation is applied, the long edge is capped at max_edge (config
+    OCR_MAX_EDGE) and, with label_crop (OCR_LABEL_CROP), the image is cropped
+    to the label.  With neither set the file is passed on exactly as opened.
+    """
+    max_edge = OCR_MAX_EDGE if max_edge is None else max_edge
+    label_crop = OCR_LABEL_CROP if label_crop is None else label_crop
+    if not max_edge and not label_crop:
+        return Image.open(image_path)
+    with Image.open(image_path) as image:
+        if max_edge:
+            # JPEG: decode at 1/2..1/8 scale, as long as both sides stay at least the capped size
+            scale = min(1.0, max_edge / max(image.size))
+            image.draft("RGB", (int(image.width * scale), int(image.height * scale)))
+        image = ImageOps.exif_transpose(image)
+        if max_edge:
+            image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        image = image.convert("RGB")
+    if label_crop:
+        box = label_box(image)
+        if box is not None:
+            image = image.crop(box)
+    return image
+
+
+def label_box(image):
+    """
+    Bounding box (left, top, right, bottom) of the label in a bottle photo,
+    or None to keep the whole frame.  Printed text is where edges are
+    densest, so the box spans the central 90% of the edge mass along each
+    axis (on a 256 px copy), plus a margin.
+    """
+    import numpy as np
+    small = image.convert("L")
+    small.thumbnail((256, 256))
+    edges = np.asarray(small.filter(ImageFilter.FIND_EDGES), dtype=np.float32)
+    edges[edges < 40] = 0  # soft texture and sensor noise
+    edges[[0, -1], :] = edges[:, [0, -1]] = 0  # the filter marks the frame border
+    if not edges.any():
+        return None
+
+    def span(profile, size):
+        cumulative = np.cumsum(profile)
+        low = int(np.searchsorted(cumulative, cumulative[-1] * 0.05))
+        high = int(np.searchsorted(cumulative, cumulative[-1] * 0.95)) + 1
+        margin = int(size * 0.08)
+        return max(0, low - margin), min(size, high + margin)
+
+    left, right = span(edges.sum(axis=0), small.width)
+    top, bottom = span(edges.sum(axis=1), small.height)
+    if (right - left) * (bottom - top) > 0.9 * small.width * small.height:
+        return None  # text all over the frame; cropping would save little
+    scale_x, scale_y = image.width / small.width, image.height / small.height
+    return (int(left * scale_x), int(top * scale_y),
+            min(image.width, round(right * scale_x)), min(image.height, round(bottom * scale_y)))
 
 
 # ====EXTRACTION SNIPPET====#
-def extract_text_from_image(image_path):
+def extract_text_from_image(image_path, sweep=None):
     """
     enhance image using alpha and beta (contrast + brightness)
-    and use that to extract text block
+    and use that to extract text block (the image is first prepared by
+    prepare_image: reduced-scale decode, size cap, optional label crop).
+    sweep="early_exit" (config OCR_SWEEP) stops at the first contrast pass
+    whose text has a valid CAS or catalog number; "full" runs every level and
+    keeps the longest text; "two_stage" detects text once and recognizes all
+    levels in one batch (see _two_stage_texts).
     """
     try:
-        image = Image.open(image_path)
+        image = prepare_image(image_path)
     except Exception as e:
         print(f"Could not open image {image_path}: {e}")
         return ""
 
+    import numpy as np
+    reader = get_reader()
+    sweep = sweep or OCR_SWEEP
+    if sweep == "two_stage":
+        try:
+            texts = _two_stage_texts(reader, image, np)
+        except Exception as e:
+            print(f"Two-stage OCR failed for {image_path}, running the sweep: {e}")
+        else:
+            return next(filter(has_identifier, texts), max(texts, key=len, default=""))
+    early_exit = sweep == "early_exit"
     best_text = ""
     best_score = 0
-    for contrast in [0.8, 1.0, 1.5, 2.0]:
+    passes = 0
+    for contrast in OCR_CONTRAST_LEVELS:
         enhancer = ImageEnhance.Contrast(image)
         enhanced_image = enhancer.enhance(contrast)
 
         # Convert PIL image to numpy array (RGB to BGR for OpenCV if needed)
         img_np = np.array(enhanced_image)
         # EasyOCR expects RGB or grayscale, so no need to convert color order
+        passes += 1
         try:
             text_results = reader.readtext(img_np)
         except Exception as e:
@@ -45,11 +171,65 @@ def extract_text_from_image(image_path):
             continue
 
         full_text = " ".join([result[1] for result in text_results])
+        if early_exit and has_identifier(full_text):
+            best_text = full_text
+            break
         if len(full_text) > best_score:
             best_score = len(full_text)
             best_text = full_text
+    sweep_stats["images"] += 1
+    sweep_stats["passes"] += passes
     return best_text
 
+def _two_stage_texts(reader, image, np):
+    """
+    Run EasyOCR's detector once, on the unmodified image, then only its
+    recognizer on the detected boxes at every OCR_CONTRAST_LEVELS variant.
+    The variants of the area the boxes cover are stacked vertically into one
+    greyscale image, with the boxes repeated at each copy's offset, so a
+    single recognize() call reads them all.  On GPU that call batches the
+    crops; EasyOCR's CPU path (as of 1.7) ignores batch_size and recognizes
+    the boxes one by one, so on CPU the saving is the skipped detector passes
+    only.  Returns one text per contrast level, in OCR_CONTRAST_LEVELS order
+    ([] if nothing was found).
+    """
+    horizontal, free = reader.detect(np.array(image.convert("RGB")))
+    horizontal, free = horizontal[0], free[0]
+    if not horizontal and not free:
+        return []
+    grey = image.convert("L")
+    xs = [x for box in horizontal for x in box[:2]] + [point[0] for box in free for point in box]
+    ys = [y for box in horizontal for y in box[2:]] + [point[1] for box in free for point in box]
+    left, top = max(0, int(min(xs))), max(0, int(min(ys)))
+    right, bottom = min(grey.width, int(max(xs)) + 1), min(grey.height, int(max(ys)) + 1)
+    region = grey.crop((left, top, right, bottom))
+    width, height = region.size
+
+    def clamp_x(x):
+        return min(max(int(x) - left, 0), width)
+
+    def clamp_y(y):
+        return min(max(int(y) - top, 0), height)
+
+    stacked = Image.new("L", (width, height * len(OCR_CONTRAST_LEVELS)))
+    horizontal_boxes, free_boxes = [], []
+    for i, contrast in enumerate(OCR_CONTRAST_LEVELS):
+        offset = i * height
+        stacked.paste(ImageEnhance.Contrast(region).enhance(contrast), (0, offset))
+        horizontal_boxes += [[clamp_x(x_min), clamp_x(x_max), clamp_y(y_min) + offset, clamp_y(y_max) + offset]
+                             for x_min, x_max, y_min, y_max in horizontal]
+        free_boxes += [[[clamp_x(x), clamp_y(y) + offset] for x, y in box] for box in free]
+
+    results = reader.recognize(np.array(stacked), horizontal_list=horizontal_boxes, free_list=free_boxes,
+                               batch_size=len(horizontal_boxes) + len(free_boxes))
+    texts = [[] for _ in OCR_CONTRAST_LEVELS]
+    for box, text, _ in results:
+        middle = (box[0][1] + box[2][1]) / 2
+        texts[min(int(middle // height), len(texts) - 1)].append(text)
+    sweep_stats["images"] += 1
+    sweep_stats["passes"] += 1
+    return [" ".join(words) for words in texts]
+
 def enrich_with_pubchem(data):
     """
 use pubchempy to extract data from available cas number
@@ -58,6 +238,7 @@ use pubchempy to extract data from available cas number
     if not cas:
        return data
     try:
+        import pubchempy as pcp
         compounds = pcp.get_compounds(cas, 'name')
         if compounds:
             comp = compounds[0] # take first entry from cas list
@@ -89,10 +270,10 @@ def parse_chemical_info(text, open_browser=False):
         "catalog_number": None
     }
 
-    # Try to extract CAS Number
-    cas_match = CAS_PATTERN.search(text)
-    if cas_match:
-        data["cas_number"] = cas_match.group(1)
+    # Try to extract CAS Number (the first one whose check digit is right, if any)
+    cas_numbers = CAS_PATTERN.findall(text)
+    if cas_numbers:
+        data["cas_number"] = next(filter(is_valid_cas, cas_numbers), cas_numbers[0])
 
     # Catalog Number
     catalog_match = CATALOG_PATTERN.search(text)
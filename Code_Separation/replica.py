@@ -0,0 +1,107 @@
+import atexit
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from config import (REPLICA_PATH, REPLICA_REFRESH_SECONDS, REPLICA_PAGES_PER_STEP,
+                    REPLICA_STEP_SLEEP)
+
+#====LOCAL SNAPSHOT REPLICA====#
+# Read-only instances can work from a copy of the shared database on local
+# disk instead of querying the network file.  A background thread copies the
+# source with sqlite3's backup API, REPLICA_PAGES_PER_STEP pages at a time, so
+# the source is only locked for short steps and the writer can keep
+# committing and checkpointing.  The copy goes to a staging file first and is
+# then swapped into the live snapshot with a fast local-to-local backup, so
+# the UI's readers are only blocked for that last millisecond-scale step.
+# Each process gets its own files, named after the source and the pid, so two
+# instances (or two source databases) on one machine never share a copy.
+
+
+class SnapshotReplica:
+    def __init__(self, source_uri, local_path=None):
+        self.source_uri = source_uri
+        self.local_path = local_path or self._default_path(source_uri)
+        self.staging_path = self.local_path + ".staging"
+        self.last_synced = None  # time.time() when the snapshot last matched the source
+        self._source = None
+        self._data_version = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _default_path(source_uri):
+        base = REPLICA_PATH or os.path.join(tempfile.gettempdir(), "chemicals-snapshot.db")
+        root, ext = os.path.splitext(base)
+        source = hashlib.blake2b(source_uri.encode(), digest_size=6).hexdigest()
+        return f"{root}-{source}-{os.getpid()}{ext}"
+
+    @property
+    def uri(self):
+        """Read-only URI for the UI's connections."""
+        return f"file:{self.local_path}?mode=ro"
+
+    def start(self):
+        """Take the first snapshot now, then keep refreshing on a background thread."""
+        self.refresh()
+        if not os.path.exists(self.local_path):
+            raise RuntimeError(f"Could not create a local snapshot of {self.source_uri}")
+        self._thread = threading.Thread(target=self._run, name="snapshot-replica", daemon=True)
+        self._thread.start()
+        atexit.register(self._remove_files)
+
+    def _remove_files(self):
+        """The copies are per process; delete them on exit (best effort)."""
+        for path in (self.local_path, self.staging_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # already gone, or still open on Windows
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def age(self):
+        """Seconds since the snapshot was last known to match the source, or None."""
+        if self.last_synced is None:
+            return None
+        return time.time() - self.last_synced
+
+    def _run(self):
+        while not self._stop.wait(REPLICA_REFRESH_SECONDS):
+            self.refresh()
+        if self._source is not None:
+            self._source.close()
+
+    def refresh(self):
+        """Copy the source if it changed since the last refresh.  Returns True if copied."""
+        try:
+            if self._source is None:
+                # kept open so PRAGMA data_version can tell us whether anything changed
+                self._source = sqlite3.connect(self.source_uri, uri=True, check_same_thread=False)
+            data_version = self._source.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version and os.path.exists(self.local_path):
+                self.last_synced = time.time()
+                return False
+
+            started = time.time()
+            staging = sqlite3.connect(self.staging_path)
+            try:
+                self._source.backup(staging, pages=REPLICA_PAGES_PER_STEP, sleep=REPLICA_STEP_SLEEP)
+                live = sqlite3.connect(self.local_path)
+                try:
+                    staging.backup(live)
+                finally:
+                    live.close()
+            finally:
+                staging.close()
+            self._data_version = data_version
+            self.last_synced = started
+            return True
+        except sqlite3.Error as e:
+            print(f"Snapshot refresh failed, keeping the previous snapshot: {e}")
+            return False
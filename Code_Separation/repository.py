@@ -0,0 +1,665 @@
+import sqlite3
+import uuid
+from dataclasses import dataclass
+from connection import get_connection, write_transaction
+from migrations import SEARCH_COLUMNS, sort_key
+from config import TABLE_COLUMNS as _VISIBLE_COLUMNS
+
+#====CHEMICAL REPOSITORY====#
+# Every query the app runs lives here.  SQL strings are module constants (or
+# built once at import from fixed column lists), so sqlite3's per-connection
+# statement cache prepares each one once and reuses it on the long-lived
+# connections from connection.py.  No caller-supplied text is ever
+# interpolated into SQL.
+
+# Columns shown in the main table, in display order
+DISPLAY_COLUMNS = ("id", "name", "cas_number", "formula", "common_name", "iupac_name",
+                   "location", "quantity", "safety_info_url", "manufacturer", "catalog_number")
+CHEMICAL_COLUMNS = DISPLAY_COLUMNS + ("product_url",)
+
+# Columns the main table loads for every row (config.TABLE_COLUMNS, id first,
+# in display order); the others are fetched one row at a time by details()
+TABLE_COLUMNS = ("id",) + tuple(c for c in DISPLAY_COLUMNS[1:] if c in _VISIBLE_COLUMNS)
+DETAIL_COLUMNS = tuple(c for c in CHEMICAL_COLUMNS if c not in TABLE_COLUMNS)
+
+# Columns that may be written one at a time (inline table edits)
+EDITABLE_COLUMNS = CHEMICAL_COLUMNS[1:]
+
+# reasons recorded with each stock movement (see ledger.py)
+RECEIVE = "receive"   # new row inserted
+MERGE = "merge"       # scanned/added again and merged into an existing row
+USE = "use"           # Use Bottle
+EDIT = "edit"         # quantity changed by hand (inline or edit dialog)
+DELETE = "delete"     # row deleted, remaining stock written off
+TRANSFER = "transfer" # moved to another location (out of the old one, into the new one)
+OPENING = "opening"   # balance of rows that existed before the ledger
+
+
+@dataclass(slots=True)
+class Chemical:
+    id: int
+    name: str
+    cas_number: str
+    formula: str
+    common_name: str
+    iupac_name: str
+    location: str
+    quantity: int
+    safety_info_url: str
+    manufacturer: str
+    catalog_number: str
+    product_url: str = None
+
+
+@dataclass(slots=True)
+class StockMovement:
+    id: int
+    chemical_id: int
+    location: str
+    delta: int
+    reason: str
+    created_at: str
+
+
+def _chemical_row(cursor, row):
+    return Chemical(*row)
+
+
+def _movement_row(cursor, row):
+    return StockMovement(*row)
+
+
+# ---- statements ----
+def _search_fts(columns):
+    return f'''
+        SELECT {', '.join('c.' + c for c in columns)}
+        FROM chemicals_fts
+        JOIN Chemicals c ON c.id = chemicals_fts.rowid
+        WHERE chemicals_fts MATCH ?
+        ORDER BY bm25(chemicals_fts, {', '.join(str(w) for w in SEARCH_COLUMNS.values())}), c.name
+    '''
+
+
+# Search by name, common_name, cas_number, catalog_number (case-insensitive)
+def _search_like(columns):
+    return f'''
+        SELECT {', '.join(columns)} FROM Chemicals
+        WHERE
+            LOWER(name) LIKE ? OR
+            LOWER(common_name) LIKE ? OR
+            LOWER(cas_number) LIKE ? OR
+            LOWER(catalog_number) LIKE ?
+        ORDER BY name
+    '''
+
+
+_SELECT_CHEMICALS = f"SELECT {', '.join(CHEMICAL_COLUMNS)} FROM Chemicals"
+_LIST_CHEMICALS = _SELECT_CHEMICALS + " ORDER BY name"
+_GET_CHEMICALS = _SELECT_CHEMICALS + " WHERE id IN (SELECT value FROM json_each(?))"
+_SEARCH_FTS = _search_fts(CHEMICAL_COLUMNS)
+_SEARCH_LIKE = _search_like(CHEMICAL_COLUMNS)
+
+# the same, projected to TABLE_COLUMNS for the main table
+_SELECT_TABLE_ROWS = f"SELECT {', '.join(TABLE_COLUMNS)} FROM Chemicals"
+_LIST_TABLE_ROWS = _SELECT_TABLE_ROWS + " ORDER BY name"
+_GET_TABLE_ROWS = _SELECT_TABLE_ROWS + " WHERE id IN (SELECT value FROM json_each(?))"
+_SEARCH_FTS_TABLE = _search_fts(TABLE_COLUMNS)
+_SEARCH_LIKE_TABLE = _search_like(TABLE_COLUMNS)
+_GET_DETAILS = f"SELECT {', '.join(DETAIL_COLUMNS) or 'NULL'} FROM Chemicals WHERE id = ?"
+_LOW_STOCK = _SELECT_CHEMICALS + " WHERE quantity <= ? ORDER BY name"
+# Keyset pages for the table, one fixed statement per (sort column, direction).
+# Rows are ordered by (sort key, id) and carry the sort key as a trailing
+# column.  The next page starts after the last row's (key, id); the expanded
+# WHERE (rather than a row-value comparison) lets SQLite seek the sort index.
+def _page_statement(field, descending, after):
+    key = sort_key(field)
+    cmp, direction = ("<", "DESC") if descending else (">", "ASC")
+    where = f" WHERE {key} {cmp}= :key AND ({key} {cmp} :key OR id {cmp} :id)" if after else ""
+    return (f"SELECT {', '.join(TABLE_COLUMNS)}, {key} FROM Chemicals{where}"
+            f" ORDER BY {key} {direction}, id {direction} LIMIT :limit")
+
+
+_PAGE = {(field, descending, after): _page_statement(field, descending, after)
+         for field in TABLE_COLUMNS for descending in (False, True) for after in (False, True)}
+
+_MATCH_BY_NUMBER = '''
+    SELECT id, quantity, CASE WHEN cas_key = :cas THEN 1 ELSE 2 END AS priority
+    FROM Chemicals
+    WHERE cas_key = :cas OR catalog_key = :catalog
+    ORDER BY priority, id
+    LIMIT 1
+'''
+_MATCH_BY_NAME = '''
+    SELECT id, quantity, CASE
+        WHEN common_key IS NULL AND name_key = :name THEN 3
+        WHEN name_key IS NULL AND common_key = :common THEN 4
+        WHEN common_key IS NULL THEN 5
+        ELSE 6
+    END AS priority
+    FROM Chemicals
+    WHERE (name_key IN (:name, :common) AND common_key IS NULL)
+       OR (common_key IN (:name, :common) AND name_key IS NULL)
+    ORDER BY priority, id
+    LIMIT 1
+'''
+_INSERT_CHEMICAL = '''
+    INSERT INTO Chemicals (
+        name, cas_number, formula, common_name, iupac_name, location, quantity,
+        safety_info_url, manufacturer, catalog_number, product_url
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_LAST_CHEMICAL_ID = "SELECT seq FROM sqlite_sequence WHERE name = 'Chemicals'"
+_ADD_QUANTITY = "UPDATE Chemicals SET quantity = quantity + ? WHERE id = ?"
+_DECREMENT_RETURNING = '''
+    UPDATE Chemicals SET quantity = quantity - ?
+    WHERE id = ? AND quantity >= ?
+    RETURNING quantity
+'''
+_DECREMENT = '''
+    UPDATE Chemicals SET quantity = quantity - ?
+    WHERE id = ? AND quantity >= ?
+'''
+_GET_QUANTITY = "SELECT quantity FROM Chemicals WHERE id = ?"
+_GET_STOCK = "SELECT quantity, IFNULL(location, '') FROM Chemicals WHERE id = ?"
+# one fixed statement per editable column - the column name never comes from input
+_UPDATE_FIELD = {field: f"UPDATE Chemicals SET {field} = ? WHERE id = ?" for field in EDITABLE_COLUMNS}
+_UPDATE_CHEMICAL = '''
+    UPDATE Chemicals SET
+        name = ?,
+        cas_number = ?,
+        formula = ?,
+        common_name = ?,
+        iupac_name = ?,
+        location = ?,
+        quantity = ?,
+        safety_info_url = ?,
+        manufacturer = ?,
+        catalog_number = ?,
+        product_url = ?
+    WHERE id = ?
+'''
+_DELETE_CHEMICAL = "DELETE FROM Chemicals WHERE id = ?"
+
+_MOVEMENT_COLUMNS = "id, chemical_id, location, delta, reason, created_at"
+_RECORD_MOVEMENT = '''
+    INSERT INTO stock_movements (chemical_id, location, delta, reason)
+    SELECT id, IFNULL(location, ''), ?, ? FROM Chemicals WHERE id = ?
+'''
+_RECORD_QUANTITY_CHANGE = '''
+    INSERT INTO stock_movements (chemical_id, location, delta, reason)
+    SELECT id, IFNULL(location, ''), quantity - ?, ? FROM Chemicals
+    WHERE id = ? AND quantity IS NOT ?
+'''
+_RECORD_AT_LOCATION = '''
+    INSERT INTO stock_movements (chemical_id, location, delta, reason) VALUES (?, ?, ?, ?)
+'''
+_RECORD_REMOVAL = '''
+    INSERT INTO stock_movements (chemical_id, location, delta, reason)
+    SELECT id, IFNULL(location, ''), -quantity, ? FROM Chemicals
+    WHERE id = ? AND quantity != 0
+'''
+_MOVEMENTS_FOR_CHEMICAL = f'''
+    SELECT {_MOVEMENT_COLUMNS} FROM stock_movements
+    WHERE chemical_id = ? AND created_at >= ? AND created_at < ?
+    ORDER BY created_at, id
+'''
+_MOVEMENTS_FOR_LOCATION = f'''
+    SELECT {_MOVEMENT_COLUMNS} FROM stock_movements
+    WHERE location = ? AND created_at >= ? AND created_at < ?
+    ORDER BY created_at, id
+'''
+_FOLD_MOVEMENTS = '''
+    INSERT INTO stock_snapshots (chemical_id, location, balance, as_of)
+    SELECT chemical_id, location, SUM(delta), ? FROM stock_movements
+    WHERE created_at < ?
+    GROUP BY chemical_id, location
+    ON CONFLICT (chemical_id, location) DO UPDATE SET
+        balance = balance + excluded.balance,
+        as_of = excluded.as_of
+'''
+_DELETE_MOVEMENTS_BEFORE = "DELETE FROM stock_movements WHERE created_at < ?"
+_TIMESTAMP_DAYS_AGO = "SELECT strftime('%Y-%m-%dT%H:%M:%fZ', 'now', ?)"
+#==============================#
+
+
+#====BACKENDS====#
+class SQLiteBackend:
+    """The on-disk database, through the shared per-thread connections."""
+    def __init__(self, db_uri=None):
+        self.db_uri = db_uri
+
+    def connection(self):
+        return get_connection(self.db_uri)
+
+    def transaction(self):
+        return write_transaction(self.db_uri)
+
+
+class MemoryBackend(SQLiteBackend):
+    """
+    A private in-memory database with the full schema, for unit tests and
+    benchmarks.  Uses a shared-cache URI so every thread sees the same data;
+    the database lives as long as this object.
+    """
+    def __init__(self, name=None):
+        from database import create_database
+        super().__init__(f"file:{name or uuid.uuid4().hex}?mode=memory&cache=shared")
+        # an in-memory database is dropped when its last connection closes
+        self._keepalive = sqlite3.connect(self.db_uri, uri=True, check_same_thread=False)
+        create_database(self.db_uri, readonly=False)
+#==============================#
+
+
+# SQLite's TRIM() strips spaces only and its LOWER() folds ASCII only
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def normalize(s):
+    """Match key of a value, exactly as migrations._key_expr() stores it: NULLIF(LOWER(TRIM(s)), '')."""
+    return s.strip(" ").translate(_ASCII_LOWER) or None if s else None
+
+
+def match_keys(info):
+    """Normalized (name, common_name, cas_number, catalog_number) of an info dict."""
+    return (
+        normalize(info.get("name")),
+        normalize(info.get("common_name")),
+        normalize(info.get("cas_number")),
+        normalize(info.get("catalog_number")),
+    )
+
+
+def fts_query(query_text):
+    """
+    Turn free text into an FTS5 query: every word must match as a prefix.
+    Words are quoted so punctuation (CAS dashes, dots) is never FTS syntax.
+    """
+    terms = []
+    for word in query_text.split():
+        terms.append('"' + word.replace('"', '""') + '"*')
+    return " ".join(terms)
+
+
+def _insert_params(info):
+    return (
+        info.get("name"),
+        info.get("cas_number"),
+        info.get("formula"),
+        info.get("common_name"),
+        info.get("iupac_name"),
+        info.get("location"),
+        info.get("quantity", 1),
+        info.get("safety_info_url"),
+        info.get("manufacturer"),
+        info.get("catalog_number"),
+        info.get("product_url"),
+    )
+
+
+class _PendingRows:
+    """
+    In-memory mirror of the merge rules for rows inserted earlier in the same
+    batch, so duplicates within a batch merge exactly as they would have if
+    saved one by one.
+    """
+    def __init__(self):
+        self.rows = []  # info dicts waiting to be inserted
+        self.by_cas = {}
+        self.by_catalog = {}
+        self.by_name_only = {}    # name of rows without a common_name
+        self.by_common_only = {}  # common_name of rows without a name
+
+    def find(self, name, common_name, cas_number, catalog_number):
+        """Return (priority, index) of the best pending match, or None."""
+        lookups = (
+            (1, self.by_cas, cas_number),
+            (2, self.by_catalog, catalog_number),
+            (3, self.by_name_only, name),
+            (4, self.by_common_only, common_name),
+            (5, self.by_name_only, common_name),
+            (6, self.by_common_only, name),
+        )
+        for priority, index, key in lookups:
+            if key and key in index:
+                return priority, index[key]
+        return None
+
+    def add(self, info, name, common_name, cas_number, catalog_number):
+        idx = len(self.rows)
+        self.rows.append(dict(info, quantity=info.get("quantity", 1)))
+        # setdefault keeps the earliest row, matching ORDER BY id in the DB
+        if cas_number:
+            self.by_cas.setdefault(cas_number, idx)
+        if catalog_number:
+            self.by_catalog.setdefault(catalog_number, idx)
+        if name and not common_name:
+            self.by_name_only.setdefault(name, idx)
+        if common_name and not name:
+            self.by_common_only.setdefault(common_name, idx)
+        return idx
+
+
+class ChemicalRepository:
+    def __init__(self, backend=None):
+        self.backend = backend or SQLiteBackend()
+
+    # ---- reads ----
+    def _chemicals(self, sql, params=(), raw=False):
+        """
+        Chemical objects, or with raw=True plain tuples in CHEMICAL_COLUMNS
+        order - cheaper when loading tens of thousands of rows into the table.
+        """
+        cursor = self.backend.connection().cursor()
+        if not raw:
+            cursor.row_factory = _chemical_row
+        return cursor.execute(sql, params).fetchall()
+
+    def list_chemicals(self, raw=False):
+        return self._chemicals(_LIST_CHEMICALS, raw=raw)
+
+    def page(self, sort_field="name", descending=False, after=None, limit=500):
+        """
+        One page of TABLE_COLUMNS tuples for the table, ordered by
+        (sort_field, id), each with its sort key appended.  Pass after=(row[-1], row[0]) of the last
+        row to get the next page.
+        """
+        key, last_id = after or (None, None)
+        return self._chemicals(_PAGE[sort_field, descending, after is not None],
+                               {"key": key, "id": last_id, "limit": limit}, raw=True)
+
+    def table_rows(self, ids):
+        """TABLE_COLUMNS tuples for the given ids (missing ids are skipped)."""
+        return self._chemicals(_GET_TABLE_ROWS, (json_ids(ids),), raw=True)
+
+    def details(self, chemical_id):
+        """{column: value} of the DETAIL_COLUMNS of one chemical, or None."""
+        row = self.backend.connection().execute(_GET_DETAILS, (chemical_id,)).fetchone()
+        return dict(zip(DETAIL_COLUMNS, row)) if row else None
+
+    def get_many(self, ids, raw=False):
+        """Chemicals with the given ids (missing ids are skipped), in no particular order."""
+        return self._chemicals(_GET_CHEMICALS, (json_ids(ids),), raw)
+
+    def get(self, chemical_id):
+        rows = self.get_many([chemical_id])
+        return rows[0] if rows else None
+
+    def low_stock(self, threshold=0):
+        return self._chemicals(_LOW_STOCK, (threshold,))
+
+    def search(self, query_text, raw=False):
+        """
+        Chemicals matching query_text, best matches first.
+
+        Uses the chemicals_fts index with bm25 ranking.  Falls back to the
+        substring LIKE scan when FTS5 is unavailable or finds nothing, so
+        mid-word fragments still match.
+        """
+        query_text = query_text.strip()
+        if not query_text:
+            return self.list_chemicals(raw)
+
+        rows = []
+        try:
+            rows = self.search_fts(query_text, raw)
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search failed, using LIKE search: {e}")
+        return rows or self.search_like(query_text, raw)
+
+    def iter_search(self, query_text, batch_size, cancelled=None):
+        """
+        search() as TABLE_COLUMNS tuples in batches of batch_size, for
+        progressive display in the table.
+
+        cancelled() is polled between batches and by SQLite's progress handler,
+        so a superseded query stops even in the middle of a long scan.  Must be
+        consumed on one thread; the connection is that thread's own.
+        """
+        query_text = query_text.strip()
+        conn = self.backend.connection()
+        if cancelled is not None:
+            conn.set_progress_handler(lambda: int(cancelled()), 1000)
+        try:
+            if not query_text:
+                plans = [(_LIST_TABLE_ROWS, ())]
+            else:
+                plans = [(_SEARCH_FTS_TABLE, (fts_query(query_text),)),
+                         (_SEARCH_LIKE_TABLE, (f'%{query_text.lower()}%',) * 4)]
+            for sql, params in plans:
+                found = False
+                try:
+                    cursor = conn.execute(sql, params)
+                    while batch := cursor.fetchmany(batch_size):
+                        found = True
+                        yield batch
+                        if cancelled is not None and cancelled():
+                            return
+                except sqlite3.OperationalError as e:
+                    if cancelled is not None and cancelled():
+                        return  # interrupted by the progress handler
+                    if sql is not _SEARCH_FTS_TABLE:
+                        raise
+                    print(f"Full-text search failed, using LIKE search: {e}")
+                if found:
+                    return
+        finally:
+            if cancelled is not None:
+                conn.set_progress_handler(None, 0)
+
+    def search_fts(self, query_text, raw=False):
+        return self._chemicals(_SEARCH_FTS, (fts_query(query_text),), raw)
+
+    def search_like(self, query_text, raw=False):
+        return self._chemicals(_SEARCH_LIKE, (f'%{query_text.lower()}%',) * 4, raw)
+
+    # ---- merge / insert ----
+    def find_existing(self, conn, name, common_name, cas_number, catalog_number):
+        """
+        Return (id, quantity, priority) of the row an incoming entry should merge
+        into, or None.
+
+        Arguments must already be normalized.  Priorities, highest first:
+          1. CAS number
+          2. catalog number
+          3. name, where the existing row has no common_name
+          4. common_name, where the existing row has no name
+          5. common_name matches existing name, and their common_name is empty
+          6. name matches existing common_name, and their name is empty
+        Priorities 1-2 and 3-6 are each resolved by a single indexed query.
+        """
+        if cas_number or catalog_number:
+            existing = conn.execute(_MATCH_BY_NUMBER, {"cas": cas_number, "catalog": catalog_number}).fetchone()
+            if existing:
+                return existing
+        if name or common_name:
+            return conn.execute(_MATCH_BY_NAME, {"name": name, "common": common_name}).fetchone()
+        return None
+
+    def save(self, info):
+        """Insert or merge a single entry.  Returns ("inserted" | "merged", id)."""
+        return self.save_many([info])[0]
+
+    def save_many(self, infos):
+        """
+        Insert or merge a batch of info dicts in a single transaction.
+
+        Uses the same merge priorities as find_existing; entries that duplicate one
+        another within the batch are merged in memory before anything is written.
+        Returns one ("inserted" | "merged", id) tuple per input, in input order.
+        """
+        pending = _PendingRows()
+        merged_qty = {}  # existing id -> quantity to add
+        outcomes = []    # ("merged", id) for existing rows, ("pending", index) otherwise
+
+        # the write lock is taken up front so lookups and writes see the same table
+        with self.backend.transaction() as conn:
+            for info in infos:
+                keys = match_keys(info)
+                quantity = info.get("quantity", 1)
+                existing = self.find_existing(conn, *keys)
+                in_batch = pending.find(*keys)
+
+                # a lower priority number wins; on a tie the older DB row wins
+                if in_batch and (not existing or in_batch[0] < existing[2]):
+                    pending.rows[in_batch[1]]["quantity"] += quantity
+                    outcomes.append(("pending", in_batch[1]))
+                elif existing:
+                    merged_qty[existing[0]] = merged_qty.get(existing[0], 0) + quantity
+                    outcomes.append(("merged", existing[0]))
+                else:
+                    outcomes.append(("pending", pending.add(info, *keys)))
+
+            if merged_qty:
+                conn.executemany(_ADD_QUANTITY, [(qty, row_id) for row_id, qty in merged_qty.items()])
+                self.record_movements(conn, [(row_id, qty, MERGE) for row_id, qty in merged_qty.items()])
+
+            inserted_ids = []
+            if pending.rows:
+                conn.executemany(_INSERT_CHEMICAL, [_insert_params(row) for row in pending.rows])
+                # AUTOINCREMENT ids are consecutive while we hold the write lock
+                last_id = conn.execute(_LAST_CHEMICAL_ID).fetchone()[0]
+                first_id = last_id - len(pending.rows) + 1
+                inserted_ids = list(range(first_id, last_id + 1))
+                self.record_movements(conn, [(row_id, row["quantity"], RECEIVE)
+                                             for row_id, row in zip(inserted_ids, pending.rows)])
+
+        first_seen = set()
+        results = []
+        for action, ref in outcomes:
+            if action == "merged":
+                results.append((action, ref))
+            elif ref in first_seen:
+                results.append(("merged", inserted_ids[ref]))
+            else:
+                first_seen.add(ref)
+                results.append(("inserted", inserted_ids[ref]))
+        return results
+
+    # ---- updates ----
+    def decrement(self, ids, amount=1):
+        """
+        Atomically take `amount` from each chemical in ids, in one transaction.
+
+        The check and the subtraction happen inside a single UPDATE, so concurrent
+        users can never lose each other's decrements or drive a quantity negative.
+        Returns {id: new_quantity} for the rows that were decremented; rows that
+        had less than `amount` left (or no longer exist) are left out.
+        """
+        remaining = {}
+        with self.backend.transaction() as conn:
+            for row_id in ids:
+                if sqlite3.sqlite_version_info >= (3, 35, 0):
+                    row = conn.execute(_DECREMENT_RETURNING, (amount, row_id, amount)).fetchone()
+                else:
+                    # no RETURNING before SQLite 3.35; the write lock keeps this atomic
+                    cursor = conn.execute(_DECREMENT, (amount, row_id, amount))
+                    row = cursor.rowcount and conn.execute(_GET_QUANTITY, (row_id,)).fetchone()
+                if row:
+                    remaining[row_id] = row[0]
+            self.record_movements(conn, [(row_id, -amount, USE) for row_id in remaining])
+        return remaining
+
+    def update_field(self, chemical_id, field, value):
+        """Set one column of one chemical; field must be in EDITABLE_COLUMNS."""
+        if field not in _UPDATE_FIELD:
+            raise ValueError(f"Column {field!r} cannot be edited")
+        with self.backend.transaction() as conn:
+            old_quantity, old_location = self._stock(conn, chemical_id)
+            conn.execute(_UPDATE_FIELD[field], (value, chemical_id))
+            if field == "location":
+                self.record_transfer(conn, chemical_id, old_location, old_quantity)
+            elif field == "quantity":
+                self.record_quantity_change(conn, chemical_id, old_quantity)
+
+    def update_fields(self, edits):
+        """Apply [(chemical_id, field, value)] edits in one transaction: all or none."""
+        for _, field, _ in edits:
+            if field not in _UPDATE_FIELD:
+                raise ValueError(f"Column {field!r} cannot be edited")
+        with self.backend.transaction():
+            for chemical_id, field, value in edits:
+                self.update_field(chemical_id, field, value)  # joins the outer transaction
+
+    def update(self, chemical_id, info):
+        """Overwrite every column of one chemical from an info dict."""
+        with self.backend.transaction() as conn:
+            old_quantity, old_location = self._stock(conn, chemical_id)
+            conn.execute(_UPDATE_CHEMICAL, _insert_params(info) + (chemical_id,))
+            # the old stock moves first, so a quantity change is booked at the new location
+            self.record_transfer(conn, chemical_id, old_location, old_quantity)
+            self.record_quantity_change(conn, chemical_id, old_quantity)
+
+    def delete(self, ids):
+        with self.backend.transaction() as conn:
+            self.record_removals(conn, ids)
+            conn.executemany(_DELETE_CHEMICAL, [(row_id,) for row_id in ids])
+
+    def _stock(self, conn, chemical_id):
+        """(quantity, location) of one chemical, or (None, None) if it does not exist."""
+        return conn.execute(_GET_STOCK, (chemical_id,)).fetchone() or (None, None)
+
+    # ---- stock ledger ----
+    def record_movements(self, conn, movements):
+        """
+        Append (chemical_id, delta, reason) movements inside the caller's write
+        transaction.  The chemical's current location is stored with each one.
+        """
+        conn.executemany(_RECORD_MOVEMENT, [(delta, reason, chemical_id)
+                                            for chemical_id, delta, reason in movements])
+
+    def record_quantity_change(self, conn, chemical_id, old_quantity, reason=EDIT):
+        """Record the difference between old_quantity and the row's quantity now, if any."""
+        conn.execute(_RECORD_QUANTITY_CHANGE, (old_quantity, reason, chemical_id, old_quantity))
+
+    def record_transfer(self, conn, chemical_id, old_location, old_quantity):
+        """If the row's location is no longer old_location, move old_quantity out of it and into the new one."""
+        _, location = self._stock(conn, chemical_id)
+        if location is None or location == old_location or not old_quantity:
+            return
+        conn.executemany(_RECORD_AT_LOCATION, [(chemical_id, old_location, -old_quantity, TRANSFER),
+                                               (chemical_id, location, old_quantity, TRANSFER)])
+
+    def record_removals(self, conn, chemical_ids):
+        """Write off the remaining quantity of rows that are about to be deleted."""
+        conn.executemany(_RECORD_REMOVAL, [(DELETE, chemical_id) for chemical_id in chemical_ids])
+
+    def _movements(self, sql, params):
+        cursor = self.backend.connection().cursor()
+        cursor.row_factory = _movement_row
+        return cursor.execute(sql, params).fetchall()
+
+    def movements_for_chemical(self, chemical_id, start=None, end=None):
+        """Movements of one chemical with start <= created_at < end (ISO-8601 UTC strings)."""
+        return self._movements(_MOVEMENTS_FOR_CHEMICAL, (chemical_id, start or "", end or "9999"))
+
+    def movements_for_location(self, location, start=None, end=None):
+        """Movements recorded at one location with start <= created_at < end."""
+        return self._movements(_MOVEMENTS_FOR_LOCATION, (location or "", start or "", end or "9999"))
+
+    def compact_movements(self, before):
+        """
+        Fold every movement older than `before` (ISO-8601 UTC string) into
+        stock_snapshots and delete it.  Returns the number of movements folded.
+        """
+        with self.backend.transaction() as conn:
+            conn.execute(_FOLD_MOVEMENTS, (before, before))
+            return conn.execute(_DELETE_MOVEMENTS_BEFORE, (before,)).rowcount
+
+    def timestamp_days_ago(self, days):
+        return self.backend.connection().execute(_TIMESTAMP_DAYS_AGO, (f"-{int(days)} days",)).fetchone()[0]
+
+
+def json_ids(ids):
+    """Encode ids for `IN (SELECT value FROM json_each(?))` - one statement for any count."""
+    return "[" + ",".join(str(int(i)) for i in ids) + "]"
+
+
+_repositories = {}
+
+
+def get_repository(db_uri=None):
+    """The shared repository for db_uri (default: the configured database)."""
+    repo = _repositories.get(db_uri)
+    if repo is None:
+        repo = _repositories[db_uri] = ChemicalRepository(SQLiteBackend(db_uri))
+    return repo
@@ -0,0 +1,77 @@
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+from config import SEARCH_BATCH_ROWS
+
+#====BACKGROUND SEARCH====#
+# Searches run on a dedicated QThread so typing never waits on SQLite.  Every
+# request carries a generation number; a newer request bumps `latest`, which
+# makes the running query stop at its next progress-handler tick and makes any
+# queued stale requests return immediately.  Results are emitted in batches of
+# SEARCH_BATCH_ROWS so the first screen appears before the whole result set is
+# read.
+
+
+class SearchWorker(QObject):
+    batch_ready = pyqtSignal(int, list, bool)  # generation, rows, first batch
+    finished = pyqtSignal(int)
+
+    def __init__(self, repo):
+        super().__init__()
+        self.repo = repo
+        self.latest = 0  # written from the GUI thread, read here
+
+    def is_stale(self, generation):
+        return generation != self.latest
+
+    @pyqtSlot(int, str)
+    def run(self, generation, text):
+        if self.is_stale(generation):
+            return
+        first = True
+        try:
+            for rows in self.repo.iter_search(text, SEARCH_BATCH_ROWS,
+                                              cancelled=lambda: self.is_stale(generation)):
+                self.batch_ready.emit(generation, rows, first)
+                first = False
+        except Exception as e:
+            print(f"Search failed: {e}")
+        if first and not self.is_stale(generation):
+            self.batch_ready.emit(generation, [], True)  # nothing matched
+        self.finished.emit(generation)
+
+
+class SearchController(QObject):
+    """
+    Owns the worker thread.  search(text) may be called on every keystroke;
+    only the newest request's batches reach `batch_ready`.
+    """
+    batch_ready = pyqtSignal(list, bool)  # rows, first batch
+    _requested = pyqtSignal(int, str)
+
+    def __init__(self, repo, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._thread = QThread()
+        self._thread.setObjectName("search-worker")
+        self._worker = SearchWorker(repo)
+        self._worker.moveToThread(self._thread)
+        self._requested.connect(self._worker.run)
+        self._worker.batch_ready.connect(self._deliver)
+        self._thread.start()
+
+    def cancel(self):
+        """Abandon any running or queued search."""
+        self._generation += 1
+        self._worker.latest = self._generation
+
+    def search(self, text):
+        self.cancel()
+        self._requested.emit(self._generation, text)
+
+    def _deliver(self, generation, rows, first):
+        if generation == self._generation:
+            self.batch_ready.emit(rows, first)
+
+    def stop(self):
+        self.cancel()
+        self._thread.quit()
+        self._thread.wait()
@@ -1,7 +1,7 @@
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import sqlite3
+from repository import get_repository
 import os
 from mail_config import EMAIL_USER, EMAIL_PASS
 
@@ -44,17 +44,11 @@ def check_low_stock_and_alert(db_uri, threshold=0):
     low_stock_items = []
 
     try:
-        with sqlite3.connect(db_uri, uri=True) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name, quantity FROM chemicals")
-            rows = cursor.fetchall()
-
-        for name, quantity in rows:
-            if quantity <= threshold:
-                low_stock_items.append({
-                    "name": name,
-                    "quantity": quantity
-                })
+        for chemical in get_repository(db_uri).low_stock(threshold):
+            low_stock_items.append({
+                "name": chemical.name,
+                "quantity": chemical.quantity
+            })
 
         # Send one email if any low stock items are found
         if low_stock_items:
@@ -7,6 +7,9 @@ jetbrains_font = QFont("Adobe Helvetica", 8)
 if jetbrains_font.family() != "Adobe Helvetica":
     jetbrains_font = QFont("Monospace", 8)
 
+# Background of table cells with inline edits that are not saved yet
+pending_edit_color = "#5a4a1c"
+
 # Dark theme stylesheet
 dark_stylesheet = """
 QWidget {
@@ -33,7 +36,7 @@ QLineEdit, QTextEdit, QPlainTextEdit {
     color: #a9b7c6;
     selection-background-color: #214283;
 }
-QTableWidget {
+QTableView {
     background-color: #313335;
     gridline-color: #555555;
     color: #a9b7c6;
@@ -45,7 +48,7 @@ QHeaderView::section {
     padding: 4px;
     border: 1px solid #555555;
 }
-QTableWidget::item:selected {
+QTableView::item:selected {
     background-color: #214283;
     color: #ffffff;
 }
@@ -0,0 +1,306 @@
+import sys
+from array import array
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor
+from repository import TABLE_COLUMNS
+from config import TABLE_PAGE_ROWS
+from styles import pending_edit_color
+
+#====VIRTUAL INVENTORY TABLE MODEL====#
+# Holds the inventory as one Python list per column instead of one
+# QTableWidgetItem per cell, and renders cell text on demand in data(), so
+# only the cells currently on screen ever become Qt strings.
+
+FIELD_HEADERS = {
+    "id": "ID", "name": "Name", "cas_number": "CAS Number", "formula": "Formula",
+    "common_name": "Common Name", "iupac_name": "IUPAC Name", "location": "Location",
+    "quantity": "Quantity", "safety_info_url": "Safety Info URL", "manufacturer": "Manufacturer",
+    "catalog_number": "Catalog Number", "product_url": "Product URL",
+}
+HEADERS = [FIELD_HEADERS[field] for field in TABLE_COLUMNS]
+
+# Map column index to database field name
+COLUMN_FIELDS = dict(enumerate(TABLE_COLUMNS))
+FIELD_COLUMNS = {field: col for col, field in COLUMN_FIELDS.items()}
+
+# Low-cardinality text columns; interning shares one string per distinct value
+_INTERNED = {"formula", "location", "manufacturer", "common_name"}
+
+
+def _intern_column(values):
+    return [sys.intern(v) if isinstance(v, str) else v for v in values]
+
+
+def _sort_value(value, field):
+    """Python equivalent of migrations.sort_key(): NULL as '' or 0, numbers before text."""
+    if value is None:
+        value = 0 if field in ("id", "quantity") else ""
+    return isinstance(value, str), value
+
+
+class ChemicalTableModel(QAbstractTableModel):
+    pending_changed = pyqtSignal(int)  # number of unsaved inline edits
+
+    def __init__(self, edit_handler=None, parent=None):
+        """
+        edit_handler(chemical_id, field, text) is called for inline edits.  It
+        returns the value to store (e.g. the int for quantity), or raises
+        ValueError to reject the edit.  Accepted edits are held as pending
+        (shown highlighted, on top of the loaded values) until commit_pending()
+        or discard_pending(); see edit_buffer.py.
+        """
+        super().__init__(parent)
+        self.edit_handler = edit_handler
+        self._ids = array("q")
+        self._columns = [[] for _ in TABLE_COLUMNS]
+        self._row_for_id = None  # built on first lookup
+        # keyset paging (set_page_source); None while showing search results
+        self._fetch_page = None
+        self._page_rows = TABLE_PAGE_ROWS
+        self._sort_field = "name"
+        self._descending = False
+        self._after = None  # (sort key, id) of the last fetched row
+        self._has_more = False
+        # (chemical_id, column) -> unsaved inline edit; keyed by id so it survives reloads
+        self._pending = {}
+        self._pending_brush = QBrush(QColor(pending_edit_color))
+
+    # ---- loading ----
+    def set_rows(self, rows):
+        """Replace the contents with rows in TABLE_COLUMNS order (extra trailing values are ignored)."""
+        self._fetch_page = None
+        self._has_more = False
+        self._reset(rows)
+
+    def set_page_source(self, fetch_page, page_rows=TABLE_PAGE_ROWS):
+        """
+        Show every row, paged in as the view scrolls.
+        fetch_page(sort_field, descending, after, limit) is ChemicalRepository.page.
+        """
+        self._fetch_page = fetch_page
+        self._page_rows = page_rows
+        rows = fetch_page(self._sort_field, self._descending, None, page_rows)
+        self._reset(rows)
+        self._advance(rows)
+
+    def _advance(self, rows):
+        self._has_more = len(rows) == self._page_rows
+        if rows:
+            self._after = (rows[-1][-1], rows[-1][0])
+
+    def ensure_rows(self, count):
+        """Fetch pages until at least count rows are loaded or the table ends."""
+        while len(self._ids) < count and self._has_more:
+            self.fetchMore(QModelIndex())
+
+    def _reset(self, rows):
+        self.beginResetModel()
+        columns = list(zip(*rows)) if rows else [() for _ in TABLE_COLUMNS]
+        self._ids = array("q", columns[0])
+        self._columns = [
+            _intern_column(columns[col]) if field in _INTERNED else list(columns[col])
+            for col, field in COLUMN_FIELDS.items()
+        ]
+        self._row_for_id = None
+        self.endResetModel()
+
+    def apply_rows(self, rows):
+        """
+        Incremental refresh: update rows whose id is already shown and append
+        the rest.  Selection and scroll position are untouched.
+        """
+        new_rows = []
+        for values in rows:
+            row = self.row_for_id(values[0])
+            if row is None:
+                new_rows.append(values)
+                continue
+            for col in COLUMN_FIELDS:
+                self._columns[col][row] = values[col]
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1),
+                                  [Qt.DisplayRole, Qt.EditRole])
+
+        self.append_rows(new_rows)
+
+    def append_rows(self, rows):
+        """Add rows at the end, e.g. the next batch of a progressive search."""
+        if not rows:
+            return
+        first = len(self._ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        columns = list(zip(*rows))
+        self._ids.extend(columns[0])
+        for col, field in COLUMN_FIELDS.items():
+            self._columns[col].extend(_intern_column(columns[col]) if field in _INTERNED else columns[col])
+        if self._row_for_id is not None:
+            self._row_for_id.update((values[0], row) for row, values in enumerate(rows, first))
+        self.endInsertRows()
+
+    def remove_ids(self, ids):
+        """Remove the rows for ids that are shown (unknown ids are ignored)."""
+        rows = sorted((r for r in map(self.row_for_id, ids) if r is not None), reverse=True)
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._ids[row]
+            for column in self._columns:
+                del column[row]
+            self.endRemoveRows()
+        if rows:
+            self._row_for_id = None
+        for chemical_id in ids:
+            self._drop_pending(chemical_id, COLUMN_FIELDS)
+
+    # ---- Qt model interface ----
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+        rows = self._fetch_page(self._sort_field, self._descending, self._after, self._page_rows)
+        self._advance(rows)
+        # rows appended by apply_rows() since the last page are already shown
+        self.append_rows([values for values in rows if self.row_for_id(values[0]) is None])
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_field = COLUMN_FIELDS[column]
+        self._descending = order == Qt.DescendingOrder
+        if self._fetch_page is not None:
+            self.set_page_source(self._fetch_page, self._page_rows)
+            return
+        # search results are all in memory; sort them here
+        field = self._sort_field
+        values = self._columns[column]
+        ids = self._ids
+        order_rows = sorted(range(len(ids)), key=lambda r: (_sort_value(values[r], field), ids[r]),
+                            reverse=self._descending)
+        self.beginResetModel()
+        self._ids = array("q", (ids[r] for r in order_rows))
+        self._columns = [[col_values[r] for r in order_rows] for col_values in self._columns]
+        self._row_for_id = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            value = self._columns[index.column()][index.row()]
+            if self._pending:
+                value = self._pending.get((self._ids[index.row()], index.column()), value)
+            return "" if value is None else str(value)
+        if role == Qt.BackgroundRole and self._pending \
+                and (self._ids[index.row()], index.column()) in self._pending:
+            return self._pending_brush
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == 0:
+            return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or index.column() not in COLUMN_FIELDS:
+            return False
+        field = COLUMN_FIELDS[index.column()]
+        chemical_id = self._ids[index.row()]
+        if self.edit_handler is not None:
+            try:
+                value = self.edit_handler(chemical_id, field, value)
+            except ValueError:
+                return False
+        self._pending[chemical_id, index.column()] = value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole, Qt.BackgroundRole])
+        self.pending_changed.emit(len(self._pending))
+        return True
+
+    # ---- pending inline edits ----
+    def pending_edits(self):
+        """[(chemical_id, field, value)] of every unsaved inline edit."""
+        return [(chemical_id, COLUMN_FIELDS[col], value) for (chemical_id, col), value in self._pending.items()]
+
+    def commit_pending(self, edits):
+        """
+        The edits were saved: make them the loaded values.  Cells edited again
+        since (a different pending value) stay pending.
+        """
+        self._settle_pending(edits, keep_value=True)
+
+    def discard_pending(self, edits=None):
+        """Drop pending edits (all by default); the cells show the loaded values again."""
+        self._settle_pending(self.pending_edits() if edits is None else edits, keep_value=False)
+
+    def _settle_pending(self, edits, keep_value):
+        touched = set()
+        for chemical_id, field, value in edits:
+            key = (chemical_id, FIELD_COLUMNS[field])
+            if key not in self._pending or self._pending[key] != value:
+                continue
+            del self._pending[key]
+            row = self.row_for_id(chemical_id)
+            if row is None:
+                continue
+            if keep_value:
+                self._columns[key[1]][row] = value
+            touched.add(row)
+        for row in touched:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1),
+                                  [Qt.DisplayRole, Qt.EditRole, Qt.BackgroundRole])
+        self.pending_changed.emit(len(self._pending))
+
+    def _drop_pending(self, chemical_id, columns):
+        """Forget pending edits overwritten by a newer value from elsewhere."""
+        if self._pending:
+            dropped = [self._pending.pop((chemical_id, col)) for col in columns
+                       if (chemical_id, col) in self._pending]
+            if dropped:
+                self.pending_changed.emit(len(self._pending))
+
+    # ---- row access for the window ----
+    def row_id(self, row):
+        return self._ids[row]
+
+    def value(self, row, field):
+        """The displayed value, including a pending edit."""
+        col = FIELD_COLUMNS[field]
+        return self._pending.get((self._ids[row], col), self._columns[col][row])
+
+    def row_values(self, row):
+        """{field: value} for one row, including pending edits."""
+        return {field: self.value(row, field) for field in FIELD_COLUMNS}
+
+    def row_for_id(self, chemical_id):
+        if self._row_for_id is None:
+            self._row_for_id = {chemical_id: row for row, chemical_id in enumerate(self._ids)}
+        return self._row_for_id.get(chemical_id)
+
+    def set_values(self, row, info):
+        """Update the displayed fields of one row from an info dict."""
+        columns = [FIELD_COLUMNS[field] for field in info if field in FIELD_COLUMNS]
+        for col in columns:
+            self._columns[col][row] = info[COLUMN_FIELDS[col]]
+        self._drop_pending(self._ids[row], columns)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1),
+                              [Qt.DisplayRole, Qt.EditRole])
+
+    def set_value(self, row, field, value):
+        """Update one cell from outside the view (no edit_handler call); hidden fields are ignored."""
+        if field not in FIELD_COLUMNS:
+            return
+        col = FIELD_COLUMNS[field]
+        self._columns[col][row] = value
+        self._drop_pending(self._ids[row], [col])
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
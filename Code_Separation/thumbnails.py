@@ -0,0 +1,121 @@
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps
+from config import THUMBNAIL_DIR, THUMBNAIL_SIZE, THUMBNAIL_CACHE_MB, THUMBNAIL_WORKERS
+
+#====THUMBNAIL CACHE====#
+# The entry dialog shows a 500px preview of the scanned photo.  Decoding a
+# 12-MP JPEG for that every time is slow, so previews are kept on disk, named
+# by a hash of the image's bytes (renamed or copied photos hit the same entry,
+# edited ones don't).  Files are touched on every hit and the least recently
+# used are deleted once the directory grows past THUMBNAIL_CACHE_MB.
+# process_image_folder() prefetches the whole folder in the background while
+# OCR runs, so by the time a dialog opens its thumbnail is already there.
+
+
+def _content_hash(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ThumbnailCache:
+    def __init__(self, directory=None, max_bytes=None, size=THUMBNAIL_SIZE):
+        self.directory = directory or THUMBNAIL_DIR or os.path.join(
+            tempfile.gettempdir(), "chemical-thumbnails")
+        self.max_bytes = THUMBNAIL_CACHE_MB * 2**20 if max_bytes is None else max_bytes
+        self.size = size
+        os.makedirs(self.directory, exist_ok=True)
+        self._hashes = {}    # (path, mtime_ns, size) -> content hash, so unchanged files aren't re-read
+        self._pending = {}   # image path -> Future of a background generation
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def get(self, image_path):
+        """Path of the thumbnail for image_path, generating it now if needed; None if unreadable."""
+        with self._lock:
+            future = self._pending.get(image_path)
+        if future is not None:
+            return future.result()  # already being made in the background
+        return self._thumbnail(image_path)
+
+    def prefetch(self, image_paths):
+        """Generate thumbnails for image_paths on background threads."""
+        submitted = []
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(THUMBNAIL_WORKERS, thread_name_prefix="thumbnails")
+            for path in image_paths:
+                if path not in self._pending:
+                    future = self._pending[path] = self._executor.submit(self._thumbnail, path)
+                    submitted.append((path, future))
+        # outside the lock: the callback runs right here if the future has already finished
+        for path, future in submitted:
+            future.add_done_callback(lambda _, path=path: self._done(path))
+
+    def _done(self, path):
+        with self._lock:
+            self._pending.pop(path, None)
+
+    def _key(self, image_path):
+        stat = os.stat(image_path)
+        file_key = (image_path, stat.st_mtime_ns, stat.st_size)
+        digest = self._hashes.get(file_key)
+        if digest is None:
+            digest = self._hashes[file_key] = _content_hash(image_path)
+        return f"{digest}-{self.size}.jpg"
+
+    def _thumbnail(self, image_path):
+        try:
+            cached = os.path.join(self.directory, self._key(image_path))
+            if os.path.exists(cached):
+                os.utime(cached)  # mark as recently used
+                return cached
+            with Image.open(image_path) as image:
+                image.draft("RGB", (self.size, self.size))  # JPEG: decode at 1/2..1/8 scale
+                image = ImageOps.exif_transpose(image)
+                image.thumbnail((self.size, self.size), Image.LANCZOS)
+                staging = f"{cached}.{threading.get_ident()}.tmp"
+                image.convert("RGB").save(staging, "JPEG", quality=85)
+            os.replace(staging, cached)
+            self.evict()
+            return cached
+        except OSError as e:
+            print(f"Could not create thumbnail for {image_path}: {e}")
+            return None
+
+    def evict(self):
+        """Delete least recently used thumbnails until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".jpg"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+_cache = None
+
+
+def get_thumbnail_cache():
+    global _cache
+    if _cache is None:
+        _cache = ThumbnailCache()
+    return _cache
@@ -1,30 +1,59 @@
 from PyQt5.QtWidgets import (QMainWindow, QFileDialog, QVBoxLayout,
-                             QPushButton, QWidget, QTableWidget, QTableWidgetItem,
-                             QHBoxLayout, QLineEdit, QDialog, QFormLayout, QDialogButtonBox, QMessageBox)
-from PyQt5.QtCore import Qt
-import sqlite3
-from database import save_to_database
-from ocr_utils import extract_text_from_image, parse_chemical_info
+                             QPushButton, QWidget, QTableView, QAbstractItemView,
+                             QHBoxLayout, QLineEdit, QLabel, QDialog, QFormLayout, QDialogButtonBox, QMessageBox)
+from PyQt5.QtCore import Qt, QTimer, QItemSelectionModel
+from repository import get_repository, DETAIL_COLUMNS
+from table_model import ChemicalTableModel, FIELD_HEADERS
+from search_worker import SearchController
+from db_writer import DatabaseWriter
+from edit_buffer import EditBuffer
+from config import SEARCH_DEBOUNCE_MS
+from ocr_pool import OcrPool, FolderScan
 from chemical_dialog import ChemicalEntryDialog
+from thumbnails import get_thumbnail_cache
 from stockmail import check_low_stock_and_alert
 #from config import DB_FILE
 import os
+from contextlib import contextmanager
 import webbrowser
 import urllib.parse
+import html
+from dataclasses import asdict
 
 # ========== MAIN APPLICATION WINDOW ==========
 class MainWindow(QMainWindow):
-    def __init__(self,db_uri):
+    def __init__(self,db_uri, replica=None):
         super().__init__()
         self.db_uri = db_uri
+        self.replica = replica
+        self.repo = get_repository(db_uri)
+        self.writer = DatabaseWriter(parent=self)  # every write runs here, off the GUI thread
+        self.ocr_pool = OcrPool(parent=self)  # started by the first folder scan
+        self.ocr_pool.result_ready.connect(self.ocr_progress)
+        self.ocr_pool.failed.connect(self.ocr_progress)
+        self.ocr_done = self.ocr_total = 0
+        self.scan = None  # the running FolderScan
+        self.scan_accepted = []  # its accepted entries, saved together when it ends
         self.setWindowTitle("Chemical Inventory")
         self.resize(1000, 600)
 
-        # Table for chemical display
-        self.table = QTableWidget()
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
-        self.table.itemChanged.connect(self.handle_cell_change)
+        # Table for chemical display; cells are rendered on demand by the model
+        self.model = ChemicalTableModel(edit_handler=self.handle_cell_change, parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.table.verticalHeader().setDefaultSectionSize(22)  # fixed row height, no per-row sizing
+        self.table.horizontalHeader().setSortIndicator(1, Qt.AscendingOrder)  # by name, as the model starts
+        self.table.setSortingEnabled(True)
+
+        # inline edits are highlighted until saved together by the edit buffer
+        self.edits = EditBuffer(self.model, self.repo, self.writer, parent=self)
+        self.edits.failed.connect(lambda e: QMessageBox.warning(
+            self, "Database Error", f"The edits could not be saved and were rolled back:\n{e}"))
+        self.model.pending_changed.connect(self.update_pending_status)
+        self.pending_label = QLabel()
+        self.statusBar().addPermanentWidget(self.pending_label)
 
         #search function
         self.search_input = QLineEdit()
@@ -33,6 +62,15 @@ class MainWindow(QMainWindow):
         self.search_button = QPushButton("Search")
         self.search_button.clicked.connect(self.search_database)
 
+        # search as you type: debounced, run on a worker thread, results in batches
+        self.search = SearchController(self.repo, parent=self)
+        self.search.batch_ready.connect(self.show_search_batch)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.search_database)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
+
         search_layout = QHBoxLayout()
         search_layout.addWidget(self.search_input)
         search_layout.addWidget(self.search_button)
@@ -47,6 +85,9 @@ class MainWindow(QMainWindow):
         self.add_manual_button = QPushButton("Add Compound Manually")
         self.add_manual_button.clicked.connect(self.add_manual_entry)
 
+        self.edit_button = QPushButton("Edit Selected")
+        self.edit_button.clicked.connect(self.edit_selected_chemical)
+
         self.delete_button = QPushButton("Delete Selected")
         self.delete_button.clicked.connect(self.delete_selected)
 
@@ -56,6 +97,12 @@ class MainWindow(QMainWindow):
         self.use_bottle_button = QPushButton("Use Bottle")
         self.use_bottle_button.clicked.connect(self.use_bottle)
 
+        self.save_edits_button = QPushButton("Save Edits")
+        self.save_edits_button.clicked.connect(self.edits.flush)
+
+        self.discard_edits_button = QPushButton("Discard Edits")
+        self.discard_edits_button.clicked.connect(self.edits.discard)
+
         self.exit_button = QPushButton("Exit")
         self.exit_button.clicked.connect(self.close)
 
@@ -64,138 +111,188 @@ class MainWindow(QMainWindow):
         button_layout.addWidget(self.process_folder_btn)
         button_layout.addWidget(self.online_search_button)
         button_layout.addWidget(self.add_manual_button)
+        button_layout.addWidget(self.edit_button)
         button_layout.addWidget(self.delete_button)
         button_layout.addWidget(self.refresh_button)
         button_layout.addWidget(self.use_bottle_button)
+        button_layout.addWidget(self.save_edits_button)
+        button_layout.addWidget(self.discard_edits_button)
         button_layout.addWidget(self.exit_button)
 
+        # Detail pane: wide columns that the table doesn't load, read for the current row only
+        # (read-only; Edit Selected opens the full entry dialog)
+        self.detail_labels = {}
+        detail_layout = QFormLayout()
+        for field in DETAIL_COLUMNS:
+            label = QLabel()
+            label.setWordWrap(True)
+            label.setOpenExternalLinks(True)
+            label.setTextInteractionFlags(Qt.TextBrowserInteraction)
+            detail_layout.addRow(FIELD_HEADERS[field] + ":", label)
+            self.detail_labels[field] = label
+        self.table.selectionModel().currentRowChanged.connect(self.show_details)
+
         layout = QVBoxLayout()
         layout.addLayout(search_layout)
         layout.addWidget(self.table)
+        layout.addLayout(detail_layout)
         layout.addLayout(button_layout)
 
         container = QWidget()
         container.setLayout(layout)
         self.setCentralWidget(container)
 
+        # Snapshot age for read-only instances working from a local replica
+        if self.replica is not None:
+            self.snapshot_timer = QTimer(self)
+            self.snapshot_timer.timeout.connect(self.update_snapshot_status)
+            self.snapshot_timer.start(5000)
+            self.update_snapshot_status()
+
         # Load data
         self.load_data()
+        self.update_pending_status(0)
+
+    def update_pending_status(self, count):
+        self.pending_label.setText(f"{count} unsaved edit{'s' if count != 1 else ''}" if count else "")
+        self.save_edits_button.setEnabled(bool(count))
+        self.discard_edits_button.setEnabled(bool(count))
+
+    def update_snapshot_status(self):
+        age = self.replica.age()
+        if age is None:
+            self.statusBar().showMessage("Read-only snapshot: not yet synced")
+        elif age < 60:
+            self.statusBar().showMessage(f"Read-only snapshot, updated {int(age)} s ago")
+        else:
+            self.statusBar().showMessage(f"Read-only snapshot, updated {int(age // 60)} min ago")
+
+    def on_search_text_changed(self, _text):
+        self.search.cancel()  # the running query is stale as soon as the text changes
+        self.search_timer.start()
 
     def search_database(self):
-            query_text = self.search_input.text().strip()
-            with sqlite3.connect(self.db_uri, uri=True) as conn:
-                cursor = conn.cursor()
-
-                if query_text:
-                    # Search by name, common_name, cas_number, catalog_number (case-insensitive)
-                    cursor.execute('''
-                        SELECT * FROM Chemicals
-                        WHERE
-                            LOWER(name) LIKE ? OR
-                            LOWER(common_name) LIKE ? OR
-                            LOWER(cas_number) LIKE ? OR
-                            LOWER(catalog_number) LIKE ?
-                        ORDER BY name
-                    ''', (f'%{query_text.lower()}%',) * 4)
-                else:
-                    # If no search, just show all
-                    cursor.execute('SELECT * FROM Chemicals ORDER BY name')
-
-                results = cursor.fetchall()
-
-            self.load_data_into_table(results)
+        self.search_timer.stop()
+        if not self.search_input.text().strip():
+            self.load_data()  # an empty search is the paged full table
+            return
+        self.search.search(self.search_input.text())
+
+    def show_search_batch(self, rows, first):
+        if first:
+            self.load_data_into_table(rows)
+        else:
+            self.model.append_rows(rows)
+
+    def closeEvent(self, event):
+        self.edits.flush()
+        if self.scan is not None:  # closed while a folder scan waits on OCR
+            self.scan.cancel()
+            self.save_scan_entries()
+        self.writer.stop()  # finish queued writes before exiting
+        self.ocr_pool.shutdown()
+        self.search.stop()
+        super().closeEvent(event)
+
+    def submit_write(self, fn, *args, on_done=None, on_error=None):
+        """Queue a write after any pending inline edits, so they reach the database in order."""
+        self.edits.flush()
+        return self.writer.submit(fn, *args, on_done=on_done, on_error=on_error)
+
+    def write_failed(self, ids, error):
+        """Roll back optimistic table changes by re-reading the rows from the database."""
+        self.refresh_ids(ids)
+        QMessageBox.warning(self, "Database Error", f"The change could not be saved:\n{error}")
 
     #snippet for reducing quantity.
     def use_bottle(self):
 
-            selected_items = self.table.selectedItems()
-            if not selected_items: # error handling for no item selected
+            selected_rows = self.selected_rows()
+            if not selected_rows: # error handling for no item selected
                 QMessageBox.warning(self, "No Selection", "Please select a chemical to mark as used.")
                 return
 
-            row = selected_items[0].row()
-            compound_id = int(self.table.item(row, 0).text())
-            quantity_item = self.table.item(row, 7)
-            current_quantity = int(quantity_item.text())
+            ids = [self.model.row_id(row) for row in selected_rows]
 
-            if current_quantity <= 0: # error handling for no bottles left already
-                QMessageBox.information(self, "Already Empty", "This chemical has no remaining quantity.")
-                return
+            # one atomic decrement per row, all in a single transaction
+            self.submit_write(self.repo.decrement, ids, 1,
+                              on_done=lambda remaining: self.bottles_used(ids, remaining),
+                              on_error=lambda e: self.write_failed(ids, e))
 
-            new_quantity = current_quantity - 1 # reduce by 1
+    def bottles_used(self, ids, remaining):
+            # update only the affected quantity cells instead of reloading the table
+            for compound_id, new_quantity in remaining.items():
+                row = self.model.row_for_id(compound_id)
+                if row is not None:
+                    self.model.set_value(row, "quantity", new_quantity)
 
-            with sqlite3.connect(self.db_uri, uri=True) as conn: # update the database
-                cursor = conn.cursor()
-                cursor.execute("UPDATE Chemicals SET quantity = ? WHERE id = ?", (new_quantity, compound_id))
+            if len(remaining) < len(ids): # error handling for no bottles left already
+                QMessageBox.information(self, "Already Empty",
+                                        "The selected chemical has no remaining quantity." if len(ids) == 1
+                                        else f"{len(ids) - len(remaining)} selected chemicals had no remaining quantity.")
 
-            self.load_data()
-
-            if new_quantity == 0:
+            if 0 in remaining.values():
                 QMessageBox.critical(self, "Reorder Alert", "Quantity is now 0. Please reorder this chemical.")
                 check_low_stock_and_alert(self.db_uri, threshold=1)
 # thinking about adding email facility
 
     def load_data(self):
-        with sqlite3.connect(self.db_uri, uri=True) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, name, cas_number, formula, common_name, iupac_name,
-                       location, quantity, safety_info_url, manufacturer, catalog_number
-                FROM Chemicals
-            """)
-            rows = cursor.fetchall()
-        self.load_data_into_table(rows)
+        """Show the whole inventory, paged in from the database as the table scrolls."""
+        self.search.cancel()
+        with self.keep_view_state():
+            self.model.set_page_source(self.repo.page)
 
     def load_data_into_table(self, rows):
-        headers = ["ID", "Name", "CAS Number", "Formula", "Common Name", "IUPAC Name", "Location", "Quantity",
-                   "Safety Info URL", "Manufacturer", "Catalog Number"]
-        self.table.blockSignals(True)
-        self.table.clear()
-        self.table.setRowCount(len(rows))
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-
-        for row_idx, row_data in enumerate(rows):
-            for col_idx, value in enumerate(row_data):
-                item = QTableWidgetItem(str(value))
-                self.table.setItem(row_idx, col_idx, item)
-                if col_idx == 0:
-                    item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                else:
-                    item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-        self.table.blockSignals(False)
+        with self.keep_view_state():
+            self.model.set_rows(rows)
+
+    @contextmanager
+    def keep_view_state(self):
+        """A full reload keeps the selection (by id) and scroll position."""
+        selected_ids = [self.model.row_id(row) for row in self.selected_rows()]
+        scroll = self.table.verticalScrollBar().value()
+        yield
+        self.model.ensure_rows(scroll + self.table.verticalScrollBar().pageStep() + 1)
+        selection = self.table.selectionModel()
+        for chemical_id in selected_ids:
+            row = self.model.row_for_id(chemical_id)
+            if row is not None:
+                selection.select(self.model.index(row, 0),
+                                 QItemSelectionModel.Select | QItemSelectionModel.Rows)
+        self.table.verticalScrollBar().setValue(scroll)
+
+    def refresh_ids(self, ids):
+        """
+        Incremental refresh after a mutation: re-query only the affected ids,
+        update or insert those rows and drop the ones that no longer exist.
+        """
+        ids = set(ids)
+        if not ids:
+            return
+        rows = self.repo.table_rows(ids)
+        self.model.apply_rows(rows)
+        self.model.remove_ids(ids - {row[0] for row in rows})
+        current = self.table.currentIndex()
+        if current.isValid() and self.model.row_id(current.row()) in ids:
+            self.show_details(current)
+
+    def show_details(self, current, _previous=None):
+        """Fill the detail pane with the current row's wide columns (one primary-key lookup)."""
+        details = self.repo.details(self.model.row_id(current.row())) if current.isValid() else None
+        for field, label in self.detail_labels.items():
+            value = (details or {}).get(field) or ""
+            text = html.escape(str(value))
+            if field.endswith("_url") and value:
+                text = f'<a href="{text}">{text}</a>'
+            label.setText(text)
+
+    def selected_rows(self):
+        return sorted(index.row() for index in self.table.selectionModel().selectedRows())
 
 #====INLINE CHEMICAL EDITING ====#
-    def handle_cell_change(self, item):
-                    row = item.row()
-                    col = item.column()
-                    row_id_item = self.table.item(row, 0)  # Hidden ID column
-
-                    if not row_id_item:
-                        return
-
-                    row_id = int(row_id_item.text())
-
-                    # Map column index to database field name
-                    column_map = {
-                        1: "name",
-                        2: "cas_number",
-                        3: "formula",
-                        4: "common_name",
-                        5: "iupac_name",
-                        6: "location",
-                        7: "quantity",
-                        8: "safety_info_url",
-                        9: "manufacturer",
-                        10: "catalog_number",
-                        11: "product_url"
-                    }
-
-                    if col not in column_map:
-                        return
-
-                    field = column_map[col]
-                    new_value = item.text()
+    def handle_cell_change(self, row_id, field, text):
+                    """Called by the table model for an inline edit; returns the value to save."""
+                    new_value = text
 
                     # Cast quantity to int if necessary
                     if field == "quantity":
@@ -203,36 +300,65 @@ class MainWindow(QMainWindow):
                             new_value = int(new_value)
                         except ValueError:
                             QMessageBox.warning(self, "Invalid Input", "Quantity must be an integer.")
-                            self.load_data()
-                            return
+                            raise
 
-                    # Update database
-                    with sqlite3.connect(self.db_uri, uri=True) as conn:
-                        cursor = conn.cursor()
-                        cursor.execute(f"UPDATE Chemicals SET {field} = ? WHERE id = ?", (new_value, row_id))
+                    # held as a pending edit; the edit buffer saves it with the rest
+                    return new_value
 #======================================#
 
 #========FOLDER SELECTION============#
     def process_image_folder(self):
+        if self.scan is not None:
+            return  # OCR waits keep the event loop running; one scan at a time
+        self.ocr_pool.start()  # load the OCR models while the folder is being picked
         folder = QFileDialog.getExistingDirectory(self, "Select Folder with Images")
         if not folder:
             return
         supported_exts = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff')
-        for file in os.listdir(folder):
-            if file.lower().endswith(supported_exts):
-                full_path = os.path.join(folder, file)
-                text = extract_text_from_image(full_path)
-                parsed_info = parse_chemical_info(text)  # no browser side‑effect by default
-
-                folder_name = os.path.basename(folder)
+        image_paths = [os.path.join(folder, file) for file in os.listdir(folder)
+                       if file.lower().endswith(supported_exts)]
+        # previews are made in the background while OCR runs, so each dialog opens at once
+        get_thumbnail_cache().prefetch(image_paths)
+        # images are OCR'd a few ahead of the dialog; Stop Scan cancels the rest
+        scan = self.scan = FolderScan(self.ocr_pool, image_paths)
+        self.process_folder_btn.setEnabled(False)
+        self.ocr_done, self.ocr_total = 0, len(image_paths)
+        folder_name = os.path.basename(folder)
+        try:
+            for full_path, text, parsed_info in scan:
                 if not parsed_info.get("location"):
                     parsed_info["location"] = folder_name
 
-                dialog = ChemicalEntryDialog(parsed_info, image_path=full_path)
+                dialog = ChemicalEntryDialog(parsed_info, image_path=full_path, allow_stop=True)
                 if dialog.exec_() == QDialog.Accepted:
-                    info = dialog.get_data()
-                    save_to_database(info)
-        self.load_data()
+                    self.scan_accepted.append(dialog.get_data())
+                elif dialog.stop_requested:
+                    scan.cancel()
+        finally:
+            self.scan = None
+            self.process_folder_btn.setEnabled(True)
+            self.save_scan_entries()  # entries accepted before a stop or an error are still saved
+            if scan.images:
+                # counted in the workers (see ocr_pool.scan_image) and summed by the scan
+                message = f"OCR finished: {scan.images} images, {scan.average_passes():.2f} passes per image"
+                print(message)
+                self.statusBar().showMessage(message, 10000)
+
+    def save_scan_entries(self):
+        """Save the scan's accepted entries together, so the whole folder commits once."""
+        accepted, self.scan_accepted = self.scan_accepted, []
+        if accepted:
+            self.save_entries(accepted)
+
+    def ocr_progress(self, *_):
+        self.ocr_done += 1
+        self.statusBar().showMessage(f"OCR: {self.ocr_done}/{self.ocr_total} images read", 5000)
+
+    def save_entries(self, infos):
+        """Insert/merge entries on the writer thread; rows appear once committed."""
+        self.submit_write(self.repo.save_many, infos,
+                          on_done=lambda outcomes: self.refresh_ids(row_id for _, row_id in outcomes),
+                          on_error=lambda e: self.write_failed([], e))
 
     # ======================================#
 
@@ -276,8 +402,7 @@ class MainWindow(QMainWindow):
                 chem_dialog = ChemicalEntryDialog(info)
                 if chem_dialog.exec_() == QDialog.Accepted:
                     final_info = chem_dialog.get_data()
-                    save_to_database(final_info)
-                    self.load_data()
+                    self.save_entries([final_info])
 
             dialog.accept()
 
@@ -292,89 +417,64 @@ class MainWindow(QMainWindow):
         dialog = ChemicalEntryDialog()
         if dialog.exec_() == QDialog.Accepted:
             info = dialog.get_data()
-            save_to_database(info)
-            self.load_data()
+            self.save_entries([info])
 
     # ======================================#
 
     # ==================MANUAL ENTRY FOR CHEMICALS=================#
     def delete_selected(self):
-        selected_items = self.table.selectedItems()
-        if not selected_items:
+        selected_rows = self.selected_rows()
+        if not selected_rows:
             QMessageBox.warning(self, "No selection", "Please select a row to delete.")
             return
-        row = selected_items[0].row()
-        compound_id = int(self.table.item(row, 0).text())
+        compound_ids = [self.model.row_id(row) for row in selected_rows]
+        if len(compound_ids) == 1:
+            question = f"Delete compound ID {compound_ids[0]}?"
+        else:
+            question = f"Delete {len(compound_ids)} selected compounds?"
 
-        confirm = QMessageBox.question(self, "Confirm Delete", f"Delete compound ID {compound_id}?", QMessageBox.Yes | QMessageBox.No)
+        confirm = QMessageBox.question(self, "Confirm Delete", question, QMessageBox.Yes | QMessageBox.No)
         if confirm == QMessageBox.Yes:
-            with sqlite3.connect(self.db_uri, uri=True) as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM Chemicals WHERE id = ?", (compound_id,))
-            self.load_data()
+            # the rows go now; they come back if the delete fails
+            self.model.remove_ids(compound_ids)
+            self.submit_write(self.repo.delete, compound_ids,
+                              on_error=lambda e: self.write_failed(compound_ids, e))
             # ======================================#
 
     # ==================INLINE EDIT ENTRY FOR CHEMICALS=================#
     def edit_selected_chemical(self):
-        selected_items = self.table.selectedItems()
-        if not selected_items:
+        selected_rows = self.selected_rows()
+        if not selected_rows:
+            QMessageBox.warning(self, "No selection", "Please select a row to edit.")
             return
+        if len(selected_rows) > 1:
+            QMessageBox.warning(self, "Several rows selected", "Please select a single row to edit.")
+            return
+
+        row = selected_rows[0]
+        row_id = self.model.row_id(row)
 
-        # Assuming ID is stored in column 0 (hidden or visible)
-        row = selected_items[0].row()
-        row_id = int(self.table.item(row, 0).text())
-
-        # Gather current info from the row to pass to dialog
-        info = {
-            "name": self.table.item(row, 1).text(),
-            "cas_number": self.table.item(row, 2).text(),
-            "formula": self.table.item(row, 3).text(),
-            "common_name": self.table.item(row, 4).text(),
-            "iupac_name": self.table.item(row, 5).text(),
-            "location": self.table.item(row, 6).text(),
-            "quantity": int(self.table.item(row, 7).text()),
-            "manufacturer": self.table.item(row, 9).text(),
-            "catalog_number": self.table.item(row, 10).text(),
-            # Include any other fields as needed
-        }
+        # Gather current info to pass to dialog: the stored row, plus any pending edits
+        # shown in the table
+        chemical = self.repo.get(row_id)
+        if chemical is None:
+            return
+        values = asdict(chemical)
+        values.update(self.model.row_values(row))
+        info = {field: ("" if value is None else value) for field, value in values.items() if field != "id"}
 
         dialog = ChemicalEntryDialog(info)
         if dialog.exec_() == QDialog.Accepted:
             updated_info = dialog.get_data()
             self.update_database_row(row_id, updated_info)
-            self.load_data()  # refresh table display
 
             # ======================================#
 
     # ==================STORE EDITTED ENTRY FOR CHEMICALS=================#
     def update_database_row(self, row_id, info):
-        with sqlite3.connect(self.db_uri, uri=True) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE Chemicals SET
-                    name = ?,
-                    cas_number = ?,
-                    formula = ?,
-                    common_name = ?,
-                    iupac_name = ?,
-                    location = ?,
-                    quantity = ?,
-                    safety_info_url = ?,
-                    manufacturer = ?,
-                    catalog_number = ?,
-                    product_url = ?
-                WHERE id = ?
-            ''', (
-                info.get("name"),
-                info.get("cas_number"),
-                info.get("formula"),
-                info.get("common_name"),
-                info.get("iupac_name"),
-                info.get("location"),
-                info.get("quantity", 1),
-                info.get("safety_info_url"),
-                info.get("manufacturer"),
-                info.get("catalog_number"),
-                info.get("product_url"),
-                row_id
-            ))
\ No newline at end of file
+        row = self.model.row_for_id(row_id)
+        if row is not None:
+            self.model.set_values(row, info)  # show the edit now
+        self.submit_write(self.repo.update, row_id, info,
+                          on_done=lambda _: self.refresh_ids([row_id]),
+                          on_error=lambda e: self.write_failed([row_id], e))